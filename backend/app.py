@@ -1,3 +1,4 @@
+import atexit
 import logging
 import os
 from flask import (
@@ -9,7 +10,6 @@ from flask import (
     send_file,
     Response,
 )
-from werkzeug.utils import secure_filename
 from flask_cors import CORS
 import json
 import time
@@ -23,8 +23,19 @@ from utils.resume_parser import ResumeParser
 from utils.jd_parser import JobDescriptionParser
 from utils.matcher import ResumeMatcher
 from utils.document_generator import DocumentGenerator
+from utils.nlp_registry import nlp_registry
+from utils.resume_cache import ResumeCache
+from utils.tfidf_model import TfidfModel
 from services.matching_service import MatchingService
 from services.batch_matching_service import BatchMatchingService
+from services.matrix_matching_service import MatrixMatchingService
+from services.library_service import LibraryService
+from services.large_batch_service import LargeBatchMatchingService
+from utils.candidate_library import CandidateLibrary
+from utils.parse_pool import ParsePool
+from utils.ranking import LiveRanking
+from utils.result_store import ResultStore
+from utils.archive_reader import ArchiveError, ArchiveReader, archive_format
 import uuid
 from flask_sock import Sock
 from services.question_generator_service import QuestionGeneratorService
@@ -42,6 +53,7 @@ job_queue = queue.Queue()
 job_progress = {}  # Tracks progress updates for each job
 job_results = {}  # Stores final results for each job
 job_results_lock = Lock()  # Ensures thread-safe access to job_results
+job_partial_results = {}  # LiveRanking of each batch job still being scored
 job_events = {}  # For WebSocket event handling
 
 # Initialize Flask app with session support
@@ -80,12 +92,69 @@ try:
     question_generator = QuestionGeneratorService()
     logger.info("Question generator service initialized")
     file_handler = FileHandler(Config)
-    resume_parser = ResumeParser(Config.SKILLS_DB_PATH)
-    jd_parser = JobDescriptionParser(Config.SKILLS_DB_PATH)
-    matcher = ResumeMatcher()
-    matching_service = MatchingService(resume_parser, jd_parser, matcher)
-    batch_matching_service = BatchMatchingService(resume_parser, jd_parser, matcher)
+    resume_parser = ResumeParser(Config.SKILLS_DB_PATH, Config.NLP_MODEL)
+    jd_parser = JobDescriptionParser(
+        Config.SKILLS_DB_PATH,
+        Config.NLP_MODEL,
+        Config.JD_CACHE_SIZE,
+        Config.JD_CACHE_TTL,
+    )
+    matcher = ResumeMatcher(
+        Config.NLP_MODEL,
+        TfidfModel.load_if_exists(Config.TFIDF_MODEL_DIR),
+        Config.SKILL_STRENGTH_MODE,
+        Config.SKILLS_DB_PATH,
+    )
+    resume_cache = ResumeCache(
+        Config.RESUME_CACHE_PATH,
+        Config.RESUME_CACHE_SIZE,
+        Config.RESUME_CACHE_MAX_DISK_ENTRIES,
+    )
+    parse_pool = None
+    if Config.PARSE_EXECUTOR == "process":
+        parse_pool = ParsePool(
+            resume_parser,
+            Config.SKILLS_DB_PATH,
+            Config.PARSE_WORKERS,
+            Config.PARSE_START_METHOD,
+        )
+        parse_pool.warm()
+        atexit.register(parse_pool.shutdown)
+    duplicate_threshold = (
+        Config.NEAR_DUPLICATE_THRESHOLD if Config.DUPLICATE_DETECTION else None
+    )
+    matching_service = MatchingService(resume_parser, jd_parser, matcher, resume_cache)
+    batch_matching_service = BatchMatchingService(
+        resume_parser, jd_parser, matcher, resume_cache, parse_pool, duplicate_threshold
+    )
+    matrix_matching_service = MatrixMatchingService(
+        resume_parser, jd_parser, matcher, resume_cache, parse_pool
+    )
+    large_batch_service = LargeBatchMatchingService(
+        resume_parser, jd_parser, matcher, resume_cache, parse_pool, duplicate_threshold
+    )
+    candidate_library = CandidateLibrary(
+        Config.LIBRARY_PATH,
+        matcher.vector_service,
+        matcher.tfidf_model,
+        duplicate_threshold,
+        Config.SKILLS_DB_PATH,
+    )
+    library_service = LibraryService(
+        resume_parser,
+        jd_parser,
+        matcher,
+        candidate_library,
+        resume_cache,
+        parse_pool,
+        duplicate_threshold,
+    )
     logger.info("Initialized application components successfully")
+    for model_name, stats in nlp_registry.stats().items():
+        logger.info(
+            f"spaCy model {model_name}: loaded in {stats['load_seconds']}s, "
+            f"{stats['memory_mb']} MB RSS"
+        )
 except Exception as e:
     logger.error(f"Error initializing components: {e}")
     raise
@@ -108,10 +177,13 @@ def process_job_queue():
                 continue
 
             # Determine job type and process accordingly
-            if "filepaths" in job_data:
+            if "large_uploads" in job_data or "archive" in job_data:
+                # Large batch streamed to an on-disk result store
+                process_large_batch_with_progress(job_id, **job_data)
+            elif "uploads" in job_data:
                 # Batch processing
                 process_batch_with_progress(job_id, **job_data)
-            elif "filepath" in job_data:
+            elif "upload" in job_data:
                 # Single file processing
                 process_single_file_with_progress(job_id, **job_data)
             else:
@@ -166,14 +238,13 @@ async def ws_progress(websocket, job_id):
 
 
 # Single file processing implementation
-def process_single_file_with_progress(job_id, filepath, temp_dir, job_description):
+def process_single_file_with_progress(job_id, upload, job_description):
     """
     Process a single resume file with real-time progress updates.
 
     Args:
         job_id: Unique identifier for the job
-        filepath: Path to the resume file
-        temp_dir: Directory for temporary files
+        upload: SpooledUpload holding the resume file
         job_description: Job description text
     """
     try:
@@ -190,9 +261,8 @@ def process_single_file_with_progress(job_id, filepath, temp_dir, job_descriptio
             job_progress[job_id] = progress_data
             logger.info(f"Updated progress for job {job_id}: {progress}% - {stage}")
 
-        # Check if file exists
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
+        if not upload.size:
+            raise ValueError(f"Uploaded file is empty: {upload.filename}")
 
         # Extract text from resume
         update_progress(10, "extracting", "Extracting text from resume...")
@@ -210,15 +280,15 @@ def process_single_file_with_progress(job_id, filepath, temp_dir, job_descriptio
         update_progress(90, "finalizing", "Generating recommendations...")
 
         # Process the match
-        result = matching_service.process_match(filepath, job_description)
+        result = matching_service.process_match(upload, job_description)
         logger.info(f"Processed resume successfully for job {job_id}")
 
         # Store results
         with job_results_lock:
             job_results[job_id] = result
 
-        # Clean up files
-        file_handler.cleanup_temp_files(filepath, temp_dir)
+        # Release the spooled upload
+        upload.close()
 
         # Update final progress
         completion_data = {
@@ -243,54 +313,150 @@ def process_single_file_with_progress(job_id, filepath, temp_dir, job_descriptio
 
         # Cleanup
         try:
-            file_handler.cleanup_temp_files(filepath, temp_dir)
+            upload.close()
         except Exception as cleanup_error:
             logger.error(f"Error during cleanup: {str(cleanup_error)}")
 
 
+def process_large_batch_with_progress(
+    job_id, form_data, large_uploads=None, archive=None
+):
+    """
+    Process a large batch of resume files, spilling every result to disk.
+
+    Args:
+        job_id: Unique identifier for the job
+        form_data: Form data including job description and optional top_k
+        large_uploads: List of disk-spooled uploads holding the resume files
+        archive: Disk-spooled ZIP/tar upload whose members are the resumes
+    """
+    store = None
+    reader = None
+    try:
+        if archive is not None:
+            reader = ArchiveReader(
+                archive.stream,
+                archive.filename,
+                Config.ARCHIVE_MAX_MEMBERS,
+                Config.ARCHIVE_MAX_MEMBER_SIZE,
+                Config.ARCHIVE_MAX_TOTAL_SIZE,
+                Config.ARCHIVE_MAX_COMPRESSION_RATIO,
+                Config.UPLOAD_SPOOL_THRESHOLD,
+            )
+            sources, total = reader, reader.total
+            logger.info(f"Starting archive batch {job_id}: {archive.filename}")
+        else:
+            sources, total = large_uploads, len(large_uploads)
+            logger.info(f"Starting large batch {job_id}: {total} files")
+
+        def on_progress(done):
+            progress_data = {
+                "status": "processing",
+                "progress": 50,
+                "stage": "calculating",
+                "message": f"{done} scored",
+                "scored": done,
+            }
+            if total:
+                progress_data["progress"] = 5 + 90 * min(done, total) // total
+                progress_data["message"] = f"{done} of {total} scored"
+                progress_data["total"] = total
+            job_progress[job_id] = progress_data
+
+        store = ResultStore(
+            os.path.join(Config.LARGE_BATCH_RESULTS_DIR, f"{job_id}.jsonl")
+        )
+        result = large_batch_service.process_large_batch(
+            sources,
+            form_data.get("job_description", ""),
+            store,
+            top_k=form_data.get("top_k", Config.LARGE_BATCH_TOP_K, type=int),
+            max_in_flight=Config.LARGE_BATCH_MAX_IN_FLIGHT,
+            on_progress=on_progress,
+        )
+        store.close()
+        result["results_path"] = store.path
+        if reader is not None:
+            result["archive"] = {
+                "members": reader.members,
+                "skipped": reader.skipped,
+                "error": reader.error,
+            }
+
+        with job_results_lock:
+            job_results[job_id] = result
+
+        job_progress[job_id] = {
+            "status": "completed",
+            "progress": 100,
+            "stage": "ranking",
+            "message": "Processing complete!",
+            "redirect_url": f"/large-batch-results/{job_id}",
+        }
+        logger.info(f"Large batch {job_id} completed successfully")
+
+    except Exception as e:
+        logger.error(f"Error in large batch processing: {str(e)}", exc_info=True)
+        if store is not None:
+            store.delete()
+        job_progress[job_id] = {
+            "status": "error",
+            "progress": 100,
+            "stage": "error",
+            "message": f"Error: {str(e)}",
+        }
+    finally:
+        if reader is not None:
+            reader.close()
+        if archive is not None:
+            archive.close()
+        for upload in large_uploads or []:
+            upload.close()
+
+
 # Batch processing implementation
-def process_batch_with_progress(job_id, filepaths, temp_dirs, form_data):
+def process_batch_with_progress(job_id, uploads, form_data):
     """
     Process multiple resume files with real-time progress updates.
 
     Args:
         job_id: Unique identifier for the job
-        filepaths: List of paths to resume files
-        temp_dirs: List of directories for temporary files
+        uploads: List of SpooledUploads holding the resume files
         form_data: Form data including job description
     """
     try:
         logger.info(f"Starting batch processing for job_id: {job_id}")
 
-        def update_progress(progress, stage, message):
+        def update_progress(progress, stage, message, **counts):
             """Update progress for the current job"""
             progress_data = {
                 "status": "processing",
                 "progress": progress,
                 "stage": stage,
                 "message": message,
+                **counts,
             }
             job_progress[job_id] = progress_data
             logger.info(f"Updated progress for job {job_id}: {progress}% - {stage}")
 
         # File processing steps
         update_progress(10, "extracting", "Extracting text from resumes...")
-        logger.info(f"Processing {len(filepaths)} files")
+        logger.info(f"Processing {len(uploads)} files")
 
         # Validate files
         saved_files = []
-        for i, filepath in enumerate(filepaths):
+        for i, upload in enumerate(uploads):
             try:
-                # Check if file exists
-                if not os.path.exists(filepath):
-                    logger.error(f"File not found: {filepath}")
+                # Skip empty uploads
+                if not upload.size:
+                    logger.error(f"Uploaded file is empty: {upload.filename}")
                     continue
 
                 # Log file details
-                logger.info(f"Processing file {i+1}/{len(filepaths)}: {filepath}")
-                saved_files.append(filepath)
+                logger.info(f"Processing file {i+1}/{len(uploads)}: {upload.filename}")
+                saved_files.append(upload)
             except Exception as e:
-                logger.error(f"Error processing file {filepath}: {str(e)}")
+                logger.error(f"Error processing file {upload.filename}: {str(e)}")
 
         if not saved_files:
             raise ValueError("No valid files to process")
@@ -299,26 +465,44 @@ def process_batch_with_progress(job_id, filepaths, temp_dirs, form_data):
         logger.info("Starting skill analysis")
         update_progress(40, "analyzing", "Analyzing skills and keywords...")
 
-        logger.info("Starting score calculation")
-        update_progress(70, "calculating", "Calculating match scores...")
-
-        logger.info("Starting candidate ranking")
-        update_progress(90, "ranking", "Ranking candidates...")
+        # Publish each candidate as soon as it is scored
+        ranking = LiveRanking(len(saved_files))
+        with job_results_lock:
+            job_partial_results[job_id] = ranking
+
+        def on_result(result):
+            scored = ranking.add(result)
+            counts = {"scored": scored, "total": ranking.total}
+            if scored < ranking.total:
+                update_progress(
+                    40 + 50 * scored // ranking.total,
+                    "calculating",
+                    f"{scored} of {ranking.total} scored",
+                    **counts,
+                )
+            else:
+                logger.info("Starting candidate ranking")
+                update_progress(90, "ranking", "Ranking candidates...", **counts)
 
         # Process the batch match with the saved files
         job_description = form_data.get("job_description", "")
         results = batch_matching_service.process_batch_match(
-            saved_files, job_description
+            saved_files,
+            job_description,
+            min_score=form_data.get("min_score", type=float),
+            top_k=form_data.get("top_k", type=int),
+            on_result=on_result,
         )
         logger.info(f"Processed {len(results)} candidates successfully")
 
         # Store results
         with job_results_lock:
             job_results[job_id] = results
+            job_partial_results.pop(job_id, None)
 
-        # Clean up files
-        for filepath, temp_dir in zip(filepaths, temp_dirs):
-            file_handler.cleanup_temp_files(filepath, temp_dir)
+        # Release the spooled uploads
+        for upload in uploads:
+            upload.close()
 
         # Update final progress
         completion_data = {
@@ -333,6 +517,8 @@ def process_batch_with_progress(job_id, filepaths, temp_dirs, form_data):
 
     except Exception as e:
         logger.error(f"Error in batch processing: {str(e)}", exc_info=True)
+        with job_results_lock:
+            job_partial_results.pop(job_id, None)
         error_data = {
             "status": "error",
             "progress": 100,
@@ -342,9 +528,9 @@ def process_batch_with_progress(job_id, filepaths, temp_dirs, form_data):
         job_progress[job_id] = error_data
 
         # Cleanup
-        for filepath, temp_dir in zip(filepaths, temp_dirs):
+        for upload in uploads:
             try:
-                file_handler.cleanup_temp_files(filepath, temp_dir)
+                upload.close()
             except Exception as cleanup_error:
                 logger.error(f"Error during cleanup: {str(cleanup_error)}")
 
@@ -440,16 +626,9 @@ def upload_file():
         if job_description == "":
             return jsonify({"error": "No job description provided"}), 400
 
-        # Create job directory
-        job_dir = os.path.join(Config.UPLOAD_FOLDER, job_id)
-        os.makedirs(job_dir, exist_ok=True)
-        logger.info(f"Job directory created at: {job_dir}")
-
-        # Save file
-        secure_name = secure_filename(file.filename)
-        filepath = os.path.join(job_dir, secure_name)
-        file.save(filepath)
-        logger.info(f"File saved to: {filepath}")
+        # Keep the file in memory (spilling to disk only if it is large)
+        upload = file_handler.spool_upload(file)
+        logger.info(f"File received: {upload.filename} ({upload.size} bytes)")
 
         # Initialize progress tracking
         job_progress[job_id] = {
@@ -466,8 +645,7 @@ def upload_file():
 
         # Queue the job for processing
         job_data = {
-            "filepath": filepath,
-            "temp_dir": job_dir,
+            "upload": upload,
             "job_description": job_description,
         }
         job_queue.put((job_id, job_data))
@@ -482,41 +660,29 @@ def upload_file():
 @app.route("/batch-upload", methods=["POST"])
 def batch_upload_files():
     """
-    Handle multiple resume uploads and batch processing.
+    Handle multiple resume uploads and batch processing. Optional min_score
+    and top_k form fields enable cascade ranking, which skips the costly
+    similarity stages for resumes that cannot qualify.
     """
     try:
         job_id = str(uuid.uuid4())
-        filepaths = []
-        temp_dirs = []
+        uploads = []
 
         logger.info(f"Starting batch upload for job_id: {job_id}")
         logger.info(f"Received {len(request.files.getlist('resumes'))} files")
 
-        # Create a dedicated directory for this job
-        job_dir = os.path.join(Config.UPLOAD_FOLDER, job_id)
-        os.makedirs(job_dir, exist_ok=True)
-        logger.info(f"Created job directory: {job_dir}")
-
-        # Save files first before starting background process
+        # Spool files before starting background process
         for file in request.files.getlist("resumes"):
             try:
                 logger.info(f"Processing file: {file.filename}")
-
-                # Create a secure filename
-                secure_name = secure_filename(file.filename)
-                filepath = os.path.join(job_dir, secure_name)
-
-                # Save the file
-                file.save(filepath)
-                filepaths.append(filepath)
-                temp_dirs.append(job_dir)  # Use job_dir as temp_dir for cleanup
-
-                logger.info(f"File saved successfully: {filepath}")
+                upload = file_handler.spool_upload(file)
+                uploads.append(upload)
+                logger.info(f"File received: {upload.filename} ({upload.size} bytes)")
             except Exception as e:
-                logger.error(f"Error saving file {file.filename}: {str(e)}")
+                logger.error(f"Error receiving file {file.filename}: {str(e)}")
                 # Continue with other files
 
-        if not filepaths:
+        if not uploads:
             return jsonify({"error": "No valid files were uploaded"}), 400
 
         # Initialize progress tracking
@@ -531,10 +697,9 @@ def batch_upload_files():
         session["current_job"] = job_id
         session["upload_time"] = time.time()
 
-        # Pass saved filepaths to background thread
+        # Pass spooled uploads to background thread
         job_data = {
-            "filepaths": filepaths,
-            "temp_dirs": temp_dirs,
+            "uploads": uploads,
             "form_data": request.form,
         }
         job_queue.put((job_id, job_data))
@@ -546,6 +711,206 @@ def batch_upload_files():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/large-batch-upload", methods=["POST"])
+def large_batch_upload():
+    """
+    Queue a batch of up to LARGE_BATCH_MAX_RESUMES resumes. Uploads are
+    spooled to disk and results are written to an on-disk store, so memory
+    does not grow with the batch size.
+    """
+    uploads = []
+    try:
+        job_description = request.form.get("job_description", "")
+        if not job_description.strip():
+            return jsonify({"error": "No job description provided"}), 400
+
+        files = [file for file in request.files.getlist("resumes") if file.filename]
+        if not files:
+            return jsonify({"error": "No resume files uploaded"}), 400
+        if len(files) > Config.LARGE_BATCH_MAX_RESUMES:
+            return (
+                jsonify({"error": f"At most {Config.LARGE_BATCH_MAX_RESUMES} resumes"}),
+                400,
+            )
+        for file in files:
+            uploads.append(file_handler.spool_upload(file, max_memory_size=0))
+
+        job_id = str(uuid.uuid4())
+        job_progress[job_id] = {
+            "status": "processing",
+            "progress": 0,
+            "stage": "extracting",
+            "message": f"Queued {len(uploads)} resumes...",
+        }
+        job_queue.put((job_id, {"large_uploads": uploads, "form_data": request.form}))
+        return jsonify({"job_id": job_id, "resumes": len(uploads)}), 202
+
+    except Exception as e:
+        logger.error(f"Error in large batch upload: {str(e)}", exc_info=True)
+        for upload in uploads:
+            upload.close()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/archive-upload", methods=["POST"])
+def archive_upload():
+    """
+    Queue a ZIP or tar(.gz) of resumes as a large batch. Members are read
+    one at a time as the batch consumes them; unsupported files are skipped.
+    """
+    archive = None
+    try:
+        job_description = request.form.get("job_description", "")
+        if not job_description.strip():
+            return jsonify({"error": "No job description provided"}), 400
+        file = request.files.get("archive")
+        if file is None or not file.filename:
+            return jsonify({"error": "No archive uploaded"}), 400
+        if archive_format(file.filename) is None:
+            return (
+                jsonify({"error": "Archive must be .zip, .tar, .tar.gz or .tgz"}),
+                400,
+            )
+
+        archive = file_handler.spool_upload(file, max_memory_size=0)
+        # Open it once now so unreadable archives (and ZIPs over the member
+        # limit) fail the request; size limits apply as members are read
+        ArchiveReader(
+            archive.stream, archive.filename, Config.ARCHIVE_MAX_MEMBERS
+        ).close()
+
+        job_id = str(uuid.uuid4())
+        job_progress[job_id] = {
+            "status": "processing",
+            "progress": 0,
+            "stage": "extracting",
+            "message": "Reading archive...",
+        }
+        job_queue.put((job_id, {"archive": archive, "form_data": request.form}))
+        return jsonify({"job_id": job_id}), 202
+
+    except ArchiveError as e:
+        archive.close()
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in archive upload: {str(e)}", exc_info=True)
+        if archive is not None:
+            archive.close()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/large-batch-results/<job_id>", methods=["GET"])
+def large_batch_results(job_id):
+    """
+    Summary statistics and top candidates of a large batch job.
+    """
+    result = job_results.get(job_id)
+    if result is None:
+        progress_status = job_progress.get(job_id)
+        if progress_status and progress_status["status"] == "processing":
+            return (
+                jsonify(
+                    {
+                        "error": "Processing",
+                        "message": "Results are still being processed",
+                        "status": progress_status,
+                    }
+                ),
+                202,
+            )
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(
+        {
+            "summary": result["summary"],
+            "candidates": result["candidates"],
+            "archive": result.get("archive"),
+            "download_url": f"/large-batch-results/{job_id}/download",
+        }
+    )
+
+
+@app.route("/large-batch-results/<job_id>/download", methods=["GET"])
+def download_large_batch_results(job_id):
+    """
+    Every candidate result of a large batch job, as JSON Lines.
+    """
+    result = job_results.get(job_id)
+    if result is None or not os.path.exists(result.get("results_path", "")):
+        return jsonify({"error": "Not found"}), 404
+    return send_file(
+        os.path.abspath(result["results_path"]),
+        mimetype="application/x-ndjson",
+        as_attachment=True,
+        download_name=f"batch-{job_id}.jsonl",
+    )
+
+
+@app.route("/matrix-match", methods=["POST"])
+def matrix_match():
+    """
+    Score several resumes against several job descriptions in one call.
+    Returns the top_k candidates per job and top_k jobs per candidate; with
+    ?stream=1 the records are streamed as newline-delimited JSON.
+    """
+    uploads = []
+    try:
+        job_descriptions = [
+            text for text in request.form.getlist("job_descriptions") if text.strip()
+        ]
+        if not job_descriptions:
+            return jsonify({"error": "No job descriptions provided"}), 400
+        if len(job_descriptions) > Config.MAX_MATRIX_JOBS:
+            return (
+                jsonify(
+                    {"error": f"At most {Config.MAX_MATRIX_JOBS} job descriptions"}
+                ),
+                400,
+            )
+
+        for file in request.files.getlist("resumes"):
+            if file.filename:
+                uploads.append(file_handler.spool_upload(file))
+        if not uploads:
+            return jsonify({"error": "No resume files uploaded"}), 400
+
+        top_k = request.values.get("top_k", Config.MATRIX_TOP_K, type=int)
+        logger.info(
+            f"Matrix match: {len(uploads)} resumes x {len(job_descriptions)} jobs"
+        )
+
+        if request.args.get("stream"):
+
+            def generate():
+                try:
+                    for record in matrix_matching_service.iter_results(
+                        uploads, job_descriptions, top_k
+                    ):
+                        yield json.dumps(record) + "\n"
+                except Exception as e:
+                    logger.error(f"Error streaming matrix match: {e}", exc_info=True)
+                    yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+                finally:
+                    for upload in uploads:
+                        upload.close()
+
+            return Response(generate(), mimetype="application/x-ndjson")
+
+        try:
+            result = matrix_matching_service.process_matrix_match(
+                uploads, job_descriptions, top_k
+            )
+        finally:
+            for upload in uploads:
+                upload.close()
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error in matrix match: {str(e)}", exc_info=True)
+        for upload in uploads:
+            upload.close()
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/results/<job_id>", methods=["GET"])
 def results(job_id):
     """
@@ -595,7 +960,9 @@ def results(job_id):
 @app.route("/batch-results/<job_id>", methods=["GET"])
 def batch_results(job_id):
     """
-    Retrieve results for a batch processing job.
+    Retrieve results for a batch processing job. With ?partial=1, a job
+    still being scored returns its top candidates so far, ranked by
+    provisional scores (skill match, plus TF-IDF with a pre-fitted model).
     """
     try:
         # Log the current state
@@ -604,6 +971,17 @@ def batch_results(job_id):
 
         # Try to get results from our global dictionary
         results = job_results.get(job_id)
+        ranking = job_partial_results.get(job_id)
+        if not results and ranking is not None and request.args.get("partial"):
+            top_k = request.args.get("top_k", Config.PARTIAL_RESULTS_TOP_K, type=int)
+            return jsonify(
+                {
+                    "candidates": ranking.top(top_k),
+                    "partial": True,
+                    "scored": ranking.scored,
+                    "total": ranking.total,
+                }
+            )
         if not results:
             logger.warning(f"No batch results found for job_id: {job_id}")
             # Check if the job is still processing
@@ -637,13 +1015,101 @@ def batch_results(job_id):
         )
 
         # Return the results as JSON
-        return jsonify({"candidates": results})
+        return jsonify({"candidates": results, "partial": False})
 
     except Exception as e:
         logger.error(f"Error retrieving batch results: {str(e)}", exc_info=True)
         return jsonify({"error": "Server error", "message": str(e)}), 500
 
 
+@app.route("/library/candidates", methods=["POST"])
+def add_library_candidates():
+    """
+    Parse uploaded resumes once and store them in the candidate library.
+    Re-uploading an identical file returns the existing candidate ID.
+    """
+    uploads = []
+    try:
+        for file in request.files.getlist("resumes"):
+            if file.filename:
+                uploads.append(file_handler.spool_upload(file))
+        if not uploads:
+            return jsonify({"error": "No resume files uploaded"}), 400
+        return jsonify({"candidates": library_service.add_resumes(uploads)})
+    except Exception as e:
+        logger.error(f"Error adding library candidates: {str(e)}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+    finally:
+        for upload in uploads:
+            upload.close()
+
+
+@app.route("/library/candidates", methods=["GET"])
+def list_library_candidates():
+    """
+    List library candidates, newest first (offset/limit paging).
+    """
+    offset = request.args.get("offset", 0, type=int)
+    limit = min(request.args.get("limit", 50, type=int), 500)
+    return jsonify(
+        {
+            "total": len(candidate_library),
+            "candidates": candidate_library.list(offset, limit),
+        }
+    )
+
+
+@app.route("/library/candidates/<int:candidate_id>", methods=["GET"])
+def get_library_candidate(candidate_id):
+    candidate = candidate_library.get(candidate_id)
+    if candidate is None:
+        return jsonify({"error": "Candidate not found"}), 404
+    return jsonify(candidate)
+
+
+@app.route("/library/candidates/<int:candidate_id>", methods=["DELETE"])
+def remove_library_candidate(candidate_id):
+    if not candidate_library.remove(candidate_id):
+        return jsonify({"error": "Candidate not found"}), 404
+    return jsonify({"status": "removed", "id": candidate_id})
+
+
+@app.route("/library/search", methods=["POST"])
+def search_library():
+    """
+    Rank the whole candidate library against a job description and
+    return the top_k candidates.
+    """
+    try:
+        job_description = request.values.get("job_description", "")
+        if not job_description.strip():
+            return jsonify({"error": "No job description provided"}), 400
+        top_k = request.values.get("top_k", Config.LIBRARY_TOP_K, type=int)
+        top_k = max(1, min(top_k, Config.MAX_LIBRARY_TOP_K))
+
+        start = time.perf_counter()
+        result = library_service.search(job_description, top_k)
+        result["library_size"] = len(candidate_library)
+        result["search_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Error searching library: {str(e)}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    """
+    Report hit/miss counters for the parsing caches.
+    """
+    return jsonify(
+        {
+            "resume_cache": resume_cache.stats(),
+            "jd_cache": jd_parser.profile_cache.stats(),
+        }
+    )
+
+
 @app.route("/cancel-job/<job_id>", methods=["POST"])
 def cancel_job(job_id):
     """
@@ -754,7 +1220,13 @@ def cleanup_old_jobs():
             for job_id in expired_jobs:
                 with job_results_lock:
                     if job_id in job_results:
-                        del job_results[job_id]
+                        result = job_results.pop(job_id)
+                        # Large batches also own an on-disk result store
+                        if isinstance(result, dict) and os.path.exists(
+                            result.get("results_path", "")
+                        ):
+                            os.remove(result["results_path"])
+                    job_partial_results.pop(job_id, None)
                     if job_id in job_progress:
                         del job_progress[job_id]
                 logger.info(f"Cleaned up expired job {job_id}")
@@ -0,0 +1,130 @@
+"""
+Benchmark peak memory of large-batch matching as the batch grows.
+
+Writes synthetic text resumes to a temporary directory and matches
+batches of increasing size with LargeBatchMatchingService (results spilled
+to an on-disk store) and, for comparison, the in-memory
+BatchMatchingService. Both use the configured duplicate detection
+(DUPLICATE_DETECTION, on by default). Peak Python heap usage is measured
+with tracemalloc; the large-batch peak should stay flat. SQLite's own page
+cache (bounded, about 2 MB) is not traced. Run from the backend directory:
+
+    python -m benchmarks.large_batch_benchmark [--sizes 200 800 3200]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from config import Config
+from services.batch_matching_service import BatchMatchingService
+from services.large_batch_service import LargeBatchMatchingService
+from utils.jd_parser import JobDescriptionParser
+from utils.matcher import ResumeMatcher
+from utils.result_store import ResultStore
+from utils.resume_parser import ResumeParser
+
+FILLER_WORDS = (
+    "Built designed led developed maintained migrated improved delivered the "
+    "team platform services pipeline for customers in production reliability "
+    "performance scalable internal tooling reporting analytics stakeholders"
+).split()
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, Django, PostgreSQL, AWS, "
+    "Docker and Kubernetes experience. React and TypeScript are a plus."
+)
+
+
+def write_resumes(directory, count, skills, words=300, seed=0):
+    """count synthetic resumes as .txt files; returns their paths"""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"resume_{index}.txt")
+        with open(path, "w") as f:
+            f.write(
+                " ".join(
+                    (
+                        rng.choice(skills)
+                        if rng.random() < 0.1
+                        else rng.choice(FILLER_WORDS)
+                    )
+                    for _ in range(words)
+                )
+            )
+        paths.append(path)
+    return paths
+
+
+def peak_memory(func):
+    """(peak traced bytes, seconds) of running func()"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 800, 3200])
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument(
+        "--skip-in-memory",
+        action="store_true",
+        help="Only measure the large-batch mode",
+    )
+    args = parser.parse_args()
+
+    with open(Config.SKILLS_DB_PATH, "r") as f:
+        skills = [skill for values in json.load(f).values() for skill in values]
+
+    resume_parser = ResumeParser(Config.SKILLS_DB_PATH, Config.NLP_MODEL)
+    jd_parser = JobDescriptionParser(Config.SKILLS_DB_PATH, Config.NLP_MODEL)
+    matcher = ResumeMatcher(Config.NLP_MODEL)
+    duplicate_threshold = (
+        Config.NEAR_DUPLICATE_THRESHOLD if Config.DUPLICATE_DETECTION else None
+    )
+    # No resume cache, so every resume is parsed and nothing is retained
+    large_service = LargeBatchMatchingService(
+        resume_parser, jd_parser, matcher, duplicate_threshold=duplicate_threshold
+    )
+    batch_service = BatchMatchingService(
+        resume_parser, jd_parser, matcher, duplicate_threshold=duplicate_threshold
+    )
+    jd_parser.process_job_description(JOB_DESCRIPTION)  # Warm the JD cache
+
+    print(f"Duplicate detection: {'on' if duplicate_threshold else 'off'}")
+    print(f"{'resumes':>8} {'mode':>10} {'peak MB':>9} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_resumes(directory, max(args.sizes), skills)
+        for size in args.sizes:
+            batch = paths[:size]
+            store = ResultStore(os.path.join(directory, f"results_{size}.jsonl"))
+            peak, seconds = peak_memory(
+                lambda: large_service.process_large_batch(
+                    iter(batch), JOB_DESCRIPTION, store, top_k=args.top_k
+                )
+            )
+            store.delete()
+            print(f"{size:>8} {'large':>10} {peak / 2**20:>9.1f} {seconds:>9.2f}")
+
+            if not args.skip_in_memory:
+                peak, seconds = peak_memory(
+                    lambda: batch_service.process_batch_match(batch, JOB_DESCRIPTION)
+                )
+                print(
+                    f"{size:>8} {'in-memory':>10} {peak / 2**20:>9.1f} {seconds:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark batch resume parsing with threads vs worker processes.
+
+Writes synthetic PDF resumes, then parses them with
+BatchMatchingService.parse_resumes in thread mode and with a warmed
+ParsePool, checking that both produce the same parses. Run from the
+backend directory:
+
+    python -m benchmarks.parse_executor_benchmark [--resumes 64] [--workers 8]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from config import Config
+from services.batch_matching_service import BatchMatchingService
+from utils.parse_pool import ParsePool
+from utils.resume_parser import ResumeParser
+
+SECTION_LINES = [
+    "Senior Software Engineer, Acme Corp  Jan 2019 - Present",
+    "Built data pipelines and REST services; 5+ years of {skill} experience.",
+    "Led migration of internal tooling to {skill} and {other}.",
+    "Education: Bachelor of Science in Computer Science 2012 - 2016",
+    "Projects: reporting platform using {skill}, {other} and dashboards.",
+]
+
+
+def write_pdf_resume(path, rng, skills, pages):
+    """A multi-page PDF resume mentioning random taxonomy skills"""
+    pdf = canvas.Canvas(path, pagesize=letter)
+    for _ in range(pages):
+        y = 750
+        pdf.drawString(72, y, "Jane Doe - jane.doe@example.com - (555) 123-4567")
+        while y > 72:
+            y -= 14
+            line = rng.choice(SECTION_LINES)
+            pdf.drawString(
+                72, y, line.format(skill=rng.choice(skills), other=rng.choice(skills))
+            )
+        pdf.showPage()
+    pdf.save()
+
+
+def comparable(parsed):
+    """Parses without per-run timings"""
+    return [
+        {key: value for key, value in resume_data.items() if key != "timings"}
+        for _, resume_data in parsed
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=64)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--start-method", default=Config.PARSE_START_METHOD)
+    args = parser.parse_args()
+
+    with open(Config.SKILLS_DB_PATH, "r") as f:
+        skills = [skill for values in json.load(f).values() for skill in values]
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(args.resumes):
+            path = os.path.join(directory, f"resume_{index}.pdf")
+            write_pdf_resume(path, rng, skills, args.pages)
+            paths.append(path)
+
+        resume_parser = ResumeParser(Config.SKILLS_DB_PATH, Config.NLP_MODEL)
+        thread_service = BatchMatchingService(resume_parser, None, None)
+
+        pool = ParsePool(
+            resume_parser, Config.SKILLS_DB_PATH, args.workers, args.start_method
+        )
+        start = time.perf_counter()
+        pool.warm()
+        warm_seconds = time.perf_counter() - start
+        process_service = BatchMatchingService(resume_parser, None, None, None, pool)
+
+        try:
+            timings = {}
+            results = {}
+            for name, service in (
+                ("threads", thread_service),
+                ("processes", process_service),
+            ):
+                start = time.perf_counter()
+                parsed, failed = service.parse_resumes(paths)
+                timings[name] = time.perf_counter() - start
+                results[name] = comparable(parsed)
+                if failed:
+                    print(f"{name}: {len(failed)} resumes failed to parse")
+        finally:
+            pool.shutdown()
+
+    print(
+        f"{args.resumes} PDF resumes, {args.pages} pages each; "
+        f"{BatchMatchingService.PARSE_THREADS} threads vs {args.workers} "
+        f"{args.start_method} workers (warm-up {warm_seconds:.2f}s)\n"
+    )
+    print(f"{'mode':>10} {'seconds':>9} {'resumes/sec':>12}")
+    for name, seconds in timings.items():
+        print(f"{name:>10} {seconds:>9.2f} {args.resumes / seconds:>12.1f}")
+    print(f"\nSpeedup: {timings['threads'] / timings['processes']:.1f}x")
+
+    if results["threads"] != results["processes"]:
+        print("Parses differ between modes")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
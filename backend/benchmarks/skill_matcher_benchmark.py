@@ -0,0 +1,106 @@
+"""
+Benchmark skill matching cost as the taxonomy grows.
+
+Compares the legacy per-skill regex scan with the compiled SkillMatcher on a
+synthetic resume. Run from the backend directory:
+
+    python -m benchmarks.skill_matcher_benchmark
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import time
+
+from utils.skill_matcher import SkillMatcher
+
+SAMPLE_RESUME = """
+John Doe - Senior Software Engineer
+Experienced in Python, Java, C++ and C# with a focus on cloud platforms.
+Built REST services with Flask, Django and Node.js deployed on AWS and Azure.
+Machine learning projects using scikit-learn, pandas, numpy and TensorFlow.
+Databases: PostgreSQL, MongoDB, Redis, Elasticsearch.
+Strong communication, teamwork and leadership skills.
+"""
+
+
+def legacy_scan(skills, text):
+    """The original implementation: one regex search per skill"""
+    found = []
+    for skill in skills:
+        pattern = r"\b" + re.escape(skill) + r"\b"
+        if re.search(pattern, text, re.IGNORECASE):
+            found.append(skill)
+    return found
+
+
+def synthetic_taxonomy(base_skills, size, seed=0):
+    """Pad the real taxonomy with random multi-word skills up to size"""
+    rng = random.Random(seed)
+    skills = list(base_skills)
+    seen = {skill.lower() for skill in skills}
+    while len(skills) < size:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        skill = " ".join(words)
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+
+def time_call(func, repeat):
+    """Best wall time in milliseconds over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills-db", default="data/technical_skills.json")
+    parser.add_argument(
+        "--sizes", default="100,1000,10000,50000", help="Comma-separated sizes"
+    )
+    parser.add_argument("--text-repeat", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=10000,
+        help="Skip the legacy scan above this taxonomy size",
+    )
+    args = parser.parse_args()
+
+    with open(args.skills_db, "r") as f:
+        base_skills = [skill for skills in json.load(f).values() for skill in skills]
+
+    text = SAMPLE_RESUME * args.text_repeat
+    print(f"Resume text: {len(text)} chars")
+    print(f"{'skills':>8} {'build ms':>10} {'matcher ms':>11} {'legacy ms':>10}")
+
+    for size in (int(value) for value in args.sizes.split(",")):
+        skills = synthetic_taxonomy(base_skills, size)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matcher_ms = time_call(lambda: matcher.find_all(text), args.repeat)
+        if size <= args.legacy_limit:
+            legacy_ms = f"{time_call(lambda: legacy_scan(skills, text), 1):10.1f}"
+        else:
+            legacy_ms = f"{'skipped':>10}"
+
+        print(f"{size:>8} {build_ms:>10.1f} {matcher_ms:>11.1f} {legacy_ms}")
+
+
+if __name__ == "__main__":
+    main()
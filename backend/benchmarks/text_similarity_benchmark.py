@@ -0,0 +1,74 @@
+"""
+Benchmark batch TF-IDF scoring against per-pair vectorizer fits.
+
+Scores N synthetic resumes against one job description, first with a fresh
+two-document TfidfVectorizer per resume (calculate_text_similarity), then
+with one corpus-level fit and a single sparse product
+(calculate_text_similarities). Run from the backend directory:
+
+    python -m benchmarks.text_similarity_benchmark
+"""
+
+import argparse
+import json
+import random
+import time
+
+from utils.matcher import ResumeMatcher
+
+FILLER_WORDS = (
+    "built designed led developed maintained migrated improved delivered "
+    "team platform services pipeline customers production reliability "
+    "performance scalable internal tooling reporting analytics stakeholders "
+    "requirements architecture testing deployment monitoring features users"
+).split()
+
+
+def synthetic_resume(rng, skills, words=400):
+    """Random resume-like text mixing taxonomy skills with filler words"""
+    tokens = []
+    while len(tokens) < words:
+        if rng.random() < 0.2:
+            tokens.append(rng.choice(skills))
+        else:
+            tokens.append(rng.choice(FILLER_WORDS))
+    return " ".join(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills-db", default="data/technical_skills.json")
+    parser.add_argument(
+        "--sizes", default="10,100,1000", help="Comma-separated batch sizes"
+    )
+    parser.add_argument("--words", type=int, default=400)
+    args = parser.parse_args()
+
+    with open(args.skills_db, "r") as f:
+        skills = [skill for values in json.load(f).values() for skill in values]
+
+    rng = random.Random(0)
+    matcher = ResumeMatcher()
+    jd_text = synthetic_resume(rng, skills, words=150)
+
+    print(f"{'resumes':>8} {'per-pair ms':>12} {'batch ms':>10} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        resumes = [synthetic_resume(rng, skills, args.words) for _ in range(size)]
+
+        start = time.perf_counter()
+        for text in resumes:
+            matcher.calculate_text_similarity(text, jd_text)
+        pair_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matcher.calculate_text_similarities(resumes, jd_text)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"{size:>8} {pair_ms:>12.1f} {batch_ms:>10.1f} "
+            f"{pair_ms / batch_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
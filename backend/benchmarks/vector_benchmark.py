@@ -0,0 +1,104 @@
+"""
+Check and benchmark the static document-vector fast path.
+
+First checks that VectorService's static vectors match Doc.vector and that
+cosines match Doc.similarity on sample resumes, exiting non-zero on a
+mismatch. Then reports documents/sec for the full pipeline, the
+vectors-only pipeline and the static table lookup. Run from the backend
+directory:
+
+    python -m benchmarks.vector_benchmark
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from utils.nlp_registry import get_nlp
+from utils.vector_service import VectorService
+
+FILLER_WORDS = (
+    "Built designed led developed maintained migrated improved delivered the "
+    "team platform services, pipeline for customers in production; reliability "
+    "performance scalable internal tooling reporting analytics stakeholders "
+    "requirements architecture testing deployment monitoring features users."
+).split()
+
+
+def synthetic_resume(rng, skills, words):
+    """Random resume-like text mixing taxonomy skills with filler words"""
+    return " ".join(
+        rng.choice(skills) if rng.random() < 0.2 else rng.choice(FILLER_WORDS)
+        for _ in range(words)
+    )
+
+
+def check_parity(service, nlp, texts, tolerance):
+    """Compare static vectors and cosines with Doc.vector / Doc.similarity"""
+    docs = [nlp(text) for text in texts]
+    static = list(service.static_vectors(texts))
+
+    vector_error = max(
+        float(np.abs(vector - doc.vector).max()) for vector, doc in zip(static, docs)
+    )
+    similarity_error = 0.0
+    for index in range(1, len(docs)):
+        expected = docs[0].similarity(docs[index])
+        actual = VectorService.cosine_similarities(static[index][None, :], static[0])[0]
+        similarity_error = max(similarity_error, abs(float(actual) - expected))
+
+    print(f"Max |vector - Doc.vector|:         {vector_error:.2e}")
+    print(f"Max |cosine - Doc.similarity|:     {similarity_error:.2e}")
+    return vector_error <= tolerance and similarity_error <= tolerance
+
+
+def docs_per_second(func, texts):
+    start = time.perf_counter()
+    func(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills-db", default="data/technical_skills.json")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--tolerance", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    with open(args.skills_db, "r") as f:
+        skills = [skill for values in json.load(f).values() for skill in values]
+
+    rng = random.Random(0)
+    texts = [synthetic_resume(rng, skills, args.words) for _ in range(args.docs)]
+
+    nlp = get_nlp()
+    vector_nlp = get_nlp(variant="vectors")
+    service = VectorService(cache_size=0, mode="static")
+    if service.mode != "static":
+        print("Model has no static vector table; nothing to compare")
+        return
+
+    if not check_parity(service, nlp, texts[:20], args.tolerance):
+        print("Parity check FAILED")
+        sys.exit(1)
+    print("Parity check passed\n")
+
+    timings = {
+        "full pipeline": lambda batch: [nlp(text).vector for text in batch],
+        "vectors pipeline": lambda batch: [
+            doc.vector for doc in vector_nlp.pipe(batch)
+        ],
+        "static table": lambda batch: list(service.static_vectors(batch)),
+    }
+    print(f"{'mode':>18} {'docs/sec':>10}")
+    for name, func in timings.items():
+        print(f"{name:>18} {docs_per_second(func, texts):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
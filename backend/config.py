@@ -7,6 +7,7 @@ class Config:
     # File upload settings
     UPLOAD_FOLDER = "data/processed"
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max upload
+    UPLOAD_SPOOL_THRESHOLD = 1024 * 1024  # Uploads above 1MB spool to disk
     ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
     ALLOWED_MIMETYPES = {
         "pdf": "application/pdf",
@@ -16,6 +17,7 @@ class Config:
 
     # Paths
     SKILLS_DB_PATH = "data/technical_skills.json"
+    SKILLS_DB_RELOAD_INTERVAL = 5  # Seconds between checks for taxonomy edits
 
     # Matching weights
     SKILL_MATCH_WEIGHT = 0.6
@@ -26,10 +28,81 @@ class Config:
     NLP_MODEL = "en_core_web_md"
     MAX_TEXT_LENGTH = 100000
 
+    # Parsed resume cache (set RESUME_CACHE_PATH to None for memory only)
+    RESUME_CACHE_SIZE = 256
+    RESUME_CACHE_PATH = "data/cache/resumes.sqlite3"
+    RESUME_CACHE_MAX_DISK_ENTRIES = 10000
+
+    # Job description profile cache
+    JD_CACHE_SIZE = 128
+    JD_CACHE_TTL = 3600  # Seconds
+
+    # Cached document vectors for semantic similarity
+    VECTOR_CACHE_SIZE = 1024
+    # "static" reads the word-vector table directly; "pipeline" uses nlp.pipe
+    VECTOR_MODE = "static"
+    # Memory-mapped word vectors shared by all workers
+    # (python -m utils.vector_store export); one subdirectory per model
+    VECTOR_STORE_DIR = "data/vectors"
+
+    # Skill strength scoring: "frequency" (mention counts) or "proximity"
+    # (also credits "N years" stated next to a skill mention)
+    SKILL_STRENGTH_MODE = "frequency"
+
+    # Pre-fitted TF-IDF model (python -m utils.tfidf_model build <corpus>);
+    # without one, TF-IDF is fitted per request
+    TFIDF_MODEL_DIR = "data/tfidf"
+
     # Multiple resume settings
     MAX_RESUMES = 10  # Maximum number of resumes to process at once
 
+    # Large batches (/large-batch-upload): results stream to an on-disk
+    # JSON Lines store; only the top-k and summary statistics stay in memory
+    LARGE_BATCH_MAX_RESUMES = 5000
+    LARGE_BATCH_TOP_K = 50
+    LARGE_BATCH_MAX_IN_FLIGHT = None  # Resumes parsed at once; None = 2 x workers
+    LARGE_BATCH_RESULTS_DIR = "data/batches"
+
+    # Archive uploads (/archive-upload): ZIP or tar(.gz) of resumes, run as
+    # a large batch. Limits guard against zip bombs.
+    ARCHIVE_MAX_MEMBERS = 5000
+    ARCHIVE_MAX_MEMBER_SIZE = MAX_CONTENT_LENGTH  # Same cap as a single upload
+    ARCHIVE_MAX_TOTAL_SIZE = 1024 * 1024 * 1024  # Decompressed bytes
+    ARCHIVE_MAX_COMPRESSION_RATIO = 100
+
+    # Duplicate resumes in batches and the candidate library: same file
+    # (content hash), same text in another format, or near-identical text
+    # (MinHash similarity at least NEAR_DUPLICATE_THRESHOLD)
+    DUPLICATE_DETECTION = True
+    NEAR_DUPLICATE_THRESHOLD = 0.8
+
+    # Candidates in a /batch-results/<job_id>?partial=1 view
+    PARTIAL_RESULTS_TOP_K = 10
+
+    # Batch resume parsing: "thread" (in-process) or "process" (worker
+    # processes that load the NLP model once at startup)
+    PARSE_EXECUTOR = "thread"
+    PARSE_WORKERS = None  # Worker processes; None means one per CPU
+    # "fork" starts every worker at startup, after the models are loaded and
+    # before any background thread, so workers share the loaded pages.
+    # "forkserver"/"spawn" re-import the main script in each worker; use
+    # them under gunicorn rather than `python app.py`.
+    PARSE_START_METHOD = "fork"
+
+    # Many-to-many matching (/matrix-match)
+    MAX_MATRIX_JOBS = 50  # Job descriptions per request
+    MATRIX_TOP_K = 5  # Ranked matches returned per job and per candidate
+
+    # Candidate library (/library/*): parsed resumes kept for later searches
+    LIBRARY_PATH = "data/library.sqlite3"
+    LIBRARY_TOP_K = 10  # Default candidates returned per search
+    MAX_LIBRARY_TOP_K = 100
+
     # Ensure required directories exist
     @classmethod
     def init_app(cls):
         os.makedirs(cls.UPLOAD_FOLDER, exist_ok=True)
+        if cls.RESUME_CACHE_PATH:
+            os.makedirs(os.path.dirname(cls.RESUME_CACHE_PATH), exist_ok=True)
+        os.makedirs(os.path.dirname(cls.LIBRARY_PATH), exist_ok=True)
+        os.makedirs(cls.LARGE_BATCH_RESULTS_DIR, exist_ok=True)
@@ -1,52 +1,429 @@
+import heapq
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
+
+from utils.dedup import DuplicateDetector, SQLiteDuplicateDetector, content_hash
+from utils.resume_cache import read_source_bytes
+from utils.text_extractor import source_name
+
 logger = logging.getLogger(__name__)
 
 
 class BatchMatchingService:
     """Service for handling multiple resume-job matching operations"""
 
-    def __init__(self, resume_parser, jd_parser, matcher):
+    # Resumes given semantic similarity per step of a cascade ranking
+    CASCADE_CHUNK_SIZE = 16
+
+    # Parsing threads when resumes are parsed in-process
+    PARSE_THREADS = 4
+
+    def __init__(
+        self,
+        resume_parser,
+        jd_parser,
+        matcher,
+        resume_cache=None,
+        parse_pool=None,
+        duplicate_threshold=None,
+    ):
         self.resume_parser = resume_parser
         self.jd_parser = jd_parser
         self.matcher = matcher
+        self.resume_cache = resume_cache
+        # Optional ParsePool: resumes are parsed in worker processes
+        self.parse_pool = parse_pool
+        # MinHash similarity above which resumes count as near duplicates;
+        # None turns duplicate detection off
+        self.duplicate_threshold = duplicate_threshold
 
-    def process_single_resume(self, resume_file_path, jd_data):
-        """Process a single resume against the job description"""
+    @property
+    def parse_workers(self):
+        """Resumes parsed concurrently"""
+        if self.parse_pool is not None:
+            return self.parse_pool.workers
+        return self.PARSE_THREADS
+
+    def parse_resume(self, resume_file_path):
+        """Parse a resume, going through the parsed-resume cache if configured"""
+        parser = self.parse_pool if self.parse_pool is not None else self.resume_parser
+        if self.resume_cache is not None:
+            return self.resume_cache.get_or_parse(resume_file_path, parser)
+        return parser.process_resume(resume_file_path)
+
+    def error_result(self, resume_file_path, error):
+        """Zero-score result recorded for a resume that could not be processed"""
+        return {
+            "resume_name": source_name(resume_file_path),
+            "error": str(error),
+            "overall_score": 0,
+            "skill_match": 0,
+            "text_similarity": 0,
+            "semantic_similarity": 0,
+            "matching_skills": [],
+            "missing_skills": [],
+            "resume_skills": [],
+            "jd_skills": [],
+        }
+
+    def duplicate_detector(self, path=None):
+        """
+        A DuplicateDetector for one batch, kept in a scratch SQLite file at
+        path if given, or None if detection is off
+        """
+        if self.duplicate_threshold is None:
+            return None
+        if path is not None:
+            return SQLiteDuplicateDetector(path, self.duplicate_threshold)
+        return DuplicateDetector(self.duplicate_threshold)
+
+    def file_hash(self, resume_file_path):
+        """Content hash of a resume's bytes, or None if it cannot be read"""
         try:
-            # Parse resume
-            resume_data = self.resume_parser.process_resume(resume_file_path)
-            logger.info(
-                f"Resume {resume_file_path} processed: {len(resume_data['skills'])} skills found"
+            return content_hash(read_source_bytes(resume_file_path))
+        except Exception as e:
+            logger.error(f"Error hashing {source_name(resume_file_path)}: {e}")
+            return None
+
+    def text_fingerprint(self, detector, resume_data):
+        """Fingerprint of a parse's normalized text, None for empty text"""
+        if not resume_data.get("text"):
+            return None
+        return detector.hasher.fingerprint(
+            self.resume_parser.preprocess_text(resume_data["text"])
+        )
+
+    def split_file_duplicates(self, resume_file_paths, detector):
+        """
+        Separate resumes whose bytes repeat an earlier one. Returns (unique
+        resumes, [(duplicate, original, kind, similarity)]).
+        """
+        unique, duplicates = [], []
+        for resume_path in resume_file_paths:
+            file_hash = self.file_hash(resume_path)
+            original = detector.find_content(file_hash) if file_hash else None
+            if original is None:
+                if file_hash:
+                    detector.add_content(resume_path, file_hash)
+                unique.append(resume_path)
+            else:
+                duplicates.append((resume_path, original, "file", 1.0))
+        return unique, duplicates
+
+    def split_text_duplicates(self, parsed, detector):
+        """
+        Separate parsed resumes whose normalized text repeats or nearly
+        repeats an earlier one. Returns (unique parsed, duplicates) in the
+        shape of split_file_duplicates.
+        """
+        unique, duplicates = [], []
+        for resume_path, resume_data in parsed:
+            fingerprint = self.text_fingerprint(detector, resume_data)
+            match = detector.find_text(fingerprint) if fingerprint else None
+            if match is None:
+                if fingerprint:
+                    detector.add_text(resume_path, fingerprint)
+                unique.append((resume_path, resume_data))
+            else:
+                original, kind, similarity = match
+                duplicates.append((resume_path, original, kind, similarity))
+        return unique, duplicates
+
+    # Duplicate kinds from strongest to weakest evidence
+    DUPLICATE_KINDS = ("file", "text", "near")
+
+    def resolve_duplicates(self, duplicates):
+        """
+        Point every duplicate at a resume that was scored: a file duplicate
+        of a resume that is itself a text or near duplicate becomes a
+        duplicate of that resume's original, with the weaker kind and the
+        lower similarity of the two links.
+        """
+        link_of = {id(resume_path): entry for resume_path, *entry in duplicates}
+        resolved = []
+        for resume_path, original, kind, similarity in duplicates:
+            seen = {id(resume_path)}
+            while id(original) in link_of and id(original) not in seen:
+                seen.add(id(original))
+                original, next_kind, next_similarity = link_of[id(original)]
+                kind = max(kind, next_kind, key=self.DUPLICATE_KINDS.index)
+                similarity = min(similarity, next_similarity)
+            resolved.append((resume_path, original, kind, similarity))
+        return resolved
+
+    def duplicate_result(
+        self, resume_file_path, original, original_result, kind, similarity
+    ):
+        """A duplicate's result: the original's scores, flagged"""
+        if original_result is None:
+            original_result = self.error_result(
+                original, "Duplicate of a resume that could not be processed"
             )
+        result = dict(original_result)
+        result.update(
+            {
+                "resume_name": source_name(resume_file_path),
+                "duplicate_of": source_name(original),
+                "duplicate_kind": kind,
+                "duplicate_similarity": similarity,
+            }
+        )
+        return result
+
+    def pruned_result(
+        self, resume_file_path, resume_data, jd_data, skill_result, upper_bound, text
+    ):
+        """Result for a resume skipped by the cascade: cheap stages only"""
+        skill_match, matching_skills, missing_skills = skill_result
+        return {
+            "resume_name": source_name(resume_file_path),
+            "contact_info": resume_data.get("contact_info", {}),
+            "pruned": True,
+            "score_upper_bound": round(float(upper_bound), 2),
+            "overall_score": 0,
+            "skill_match": round(skill_match, 2),
+            "text_similarity": round(float(text), 2),
+            "semantic_similarity": 0,
+            "matching_skills": matching_skills,
+            "missing_skills": missing_skills,
+            "resume_skills": resume_data["skills"],
+            "jd_skills": jd_data["skills"],
+        }
 
+    def score_resume(
+        self,
+        resume_file_path,
+        resume_data,
+        jd_data,
+        text_similarity=None,
+        semantic_similarity=None,
+        skill_result=None,
+    ):
+        """Score an already parsed resume against the job description"""
+        try:
             # Calculate matching score
-            result = self.matcher.get_matching_score(resume_data, jd_data)
+            result = self.matcher.get_matching_score(
+                resume_data,
+                jd_data,
+                text_similarity,
+                semantic_similarity,
+                skill_result,
+            )
 
             # Add resume metadata to result
-            result["resume_name"] = resume_file_path.split("/")[-1]
+            result["resume_name"] = source_name(resume_file_path)
             result["contact_info"] = resume_data.get("contact_info", {})
             return result
         except Exception as e:
             logger.error(
-                f"Error processing resume {resume_file_path}: {str(e)}", exc_info=True
+                f"Error scoring resume {source_name(resume_file_path)}: {str(e)}",
+                exc_info=True,
+            )
+            return self.error_result(resume_file_path, e)
+
+    def provisional_result(self, resume_file_path, resume_data, jd_data):
+        """
+        Quick result for a parsed resume while its batch is still running:
+        skill match, plus TF-IDF when a pre-fitted model makes it cheap.
+        Semantic similarity and skill strength are left to the batch scoring.
+        """
+        skill_match, matching_skills, missing_skills = (
+            self.matcher.calculate_skill_matches(
+                [resume_data["skills"]], jd_data["skills"]
+            )[0]
+        )
+        text_similarity = None
+        if self.matcher.tfidf_model is not None:
+            text_similarity = self.matcher.calculate_text_similarities(
+                [resume_data["text"]], jd_data["text"]
+            )[0]
+        return {
+            "resume_name": source_name(resume_file_path),
+            "contact_info": resume_data.get("contact_info", {}),
+            "overall_score": round(
+                self.matcher.provisional_score(skill_match, text_similarity), 2
+            ),
+            "skill_match": round(skill_match, 2),
+            "text_similarity": (
+                round(text_similarity, 2) if text_similarity is not None else None
+            ),
+            "semantic_similarity": None,
+            "matching_skills": matching_skills,
+            "missing_skills": missing_skills,
+            "provisional": True,
+        }
+
+    def process_single_resume(self, resume_file_path, jd_data):
+        """Process a single resume against the job description"""
+        try:
+            # Parse resume
+            resume_data = self.parse_resume(resume_file_path)
+            logger.info(
+                f"Resume {source_name(resume_file_path)} processed: {len(resume_data['skills'])} skills found"
+            )
+        except Exception as e:
+            logger.error(
+                f"Error processing resume {source_name(resume_file_path)}: {str(e)}",
+                exc_info=True,
             )
-            return {
-                "resume_name": resume_file_path.split("/")[-1],
-                "error": str(e),
-                "overall_score": 0,
-                "skill_match": 0,
-                "text_similarity": 0,
-                "semantic_similarity": 0,
-                "matching_skills": [],
-                "missing_skills": [],
-                "resume_skills": [],
-                "jd_skills": [],
+            return self.error_result(resume_file_path, e)
+
+        return self.score_resume(resume_file_path, resume_data, jd_data)
+
+    def parse_resumes(self, resume_file_paths, on_parsed=None):
+        """
+        Parse resumes in parallel: in threads, or fanned out to the parse
+        pool's worker processes. Returns (parsed, failed) where parsed is a
+        list of (resume, resume_data) in input order and failed holds error
+        results.
+
+        on_parsed(resume, resume_data, error) is called from this thread as
+        each resume finishes, in completion order; resume_data is None and
+        error set when parsing failed.
+        """
+        parsed = {}
+        failed = []
+
+        workers = max(1, min(self.parse_workers, len(resume_file_paths)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_index = {
+                executor.submit(self.parse_resume, resume_path): index
+                for index, resume_path in enumerate(resume_file_paths)
             }
 
-    def process_batch_match(self, resume_file_paths, job_description_text):
-        """Process multiple resumes against a single job description"""
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
+                resume_path = resume_file_paths[index]
+                try:
+                    resume_data = future.result()
+                    logger.info(
+                        f"Resume {source_name(resume_path)} processed: {len(resume_data['skills'])} skills found"
+                    )
+                    parsed[index] = (resume_path, resume_data)
+                except Exception as e:
+                    logger.error(
+                        f"Error processing resume {source_name(resume_path)}: {str(e)}",
+                        exc_info=True,
+                    )
+                    failed.append(self.error_result(resume_path, e))
+                    resume_data = None
+                    error = e
+                else:
+                    error = None
+                if on_parsed is not None:
+                    on_parsed(resume_path, resume_data, error)
+
+        return [parsed[index] for index in sorted(parsed)], failed
+
+    def cascade_scores(
+        self, parsed, jd_data, skill_results, text_similarities, min_score, top_k
+    ):
+        """
+        Fully score only the resumes that can still reach min_score or the
+        top_k. Skill match and TF-IDF are already known for every resume, so
+        each one has an upper bound on its overall score; resumes are
+        scored in descending bound order and the rest are pruned once the
+        bound drops below min_score or the k-th best score so far.
+
+        Returns ({index: result} for scored resumes in input order,
+        {index: result} for pruned ones in descending bound order).
+        """
+        skill = np.array([skill_result[0] for skill_result in skill_results])
+        bounds = self.matcher.score_upper_bound(skill, np.array(text_similarities))
+        order = np.argsort(-bounds, kind="stable")
+        floor = min_score if min_score is not None else -np.inf
+
+        scored, best_scores = {}, []  # best_scores: min-heap of the top_k
+        position = 0
+        while position < len(order):
+            cutoff = floor
+            chunk_size = self.CASCADE_CHUNK_SIZE
+            if top_k and len(best_scores) >= top_k:
+                cutoff = max(cutoff, best_scores[0])
+            elif top_k:
+                # Only fill the heap, so the k-th best cutoff applies next
+                chunk_size = min(chunk_size, top_k - len(best_scores))
+            chunk = []
+            while (
+                position < len(order)
+                and len(chunk) < chunk_size
+                and bounds[order[position]] >= cutoff
+            ):
+                chunk.append(int(order[position]))
+                position += 1
+            if not chunk:
+                break
+
+            semantic_similarities = self.matcher.calculate_semantic_similarities(
+                [parsed[index][1]["text"] for index in chunk],
+                jd_data["text"],
+                jd_data.get("vector"),
+            )
+            for index, semantic_similarity in zip(chunk, semantic_similarities):
+                resume_path, resume_data = parsed[index]
+                result = self.score_resume(
+                    resume_path,
+                    resume_data,
+                    jd_data,
+                    text_similarities[index],
+                    semantic_similarity,
+                    skill_results[index],
+                )
+                scored[index] = result
+                if top_k:
+                    score = result.get("overall_score", 0)
+                    if len(best_scores) < top_k:
+                        heapq.heappush(best_scores, score)
+                    elif score > best_scores[0]:
+                        heapq.heapreplace(best_scores, score)
+
+        pruned = {
+            int(index): self.pruned_result(
+                parsed[index][0],
+                parsed[index][1],
+                jd_data,
+                skill_results[index],
+                bounds[index],
+                text_similarities[index],
+            )
+            for index in order[position:]
+        }
+        logger.info(
+            f"Cascade ranking: scored {len(scored)}, pruned {len(pruned)} "
+            f"(min_score={min_score}, top_k={top_k})"
+        )
+        # Input order, so ties rank exactly as in a full scoring
+        return {index: scored[index] for index in sorted(scored)}, pruned
+
+    def process_batch_match(
+        self,
+        resume_file_paths,
+        job_description_text,
+        min_score=None,
+        top_k=None,
+        on_result=None,
+    ):
+        """
+        Process multiple resumes against a single job description. Resumes
+        may be file paths or in-memory uploads.
+
+        All resumes are parsed first so TF-IDF similarity can be computed
+        for the whole batch with one vectorizer fit. With min_score and/or
+        top_k, semantic similarity and skill strength are only computed for
+        resumes that can still qualify (see cascade_scores); the others are
+        returned after the ranked results with "pruned": True.
+
+        on_result(result) receives a provisional result for each resume as
+        soon as it is parsed (see provisional_result); the returned ranking
+        uses the batch scores.
+
+        With duplicate detection on, a resume with the same bytes as an
+        earlier one is not parsed, and one with the same or near-identical
+        text is not scored; both get the original's scores plus
+        duplicate_of, duplicate_kind and duplicate_similarity.
+        """
         try:
             # Parse job description (only once)
             jd_data = self.jd_parser.process_job_description(job_description_text)
@@ -54,41 +431,105 @@ class BatchMatchingService:
                 f"Job description processed successfully: {len(jd_data['skills'])} skills found"
             )
 
-            results = []
-
-            # Process resumes in parallel for better performance
-            with ThreadPoolExecutor(
-                max_workers=min(4, len(resume_file_paths))
-            ) as executor:
-                future_to_resume = {
-                    executor.submit(
-                        self.process_single_resume, resume_path, jd_data
-                    ): resume_path
-                    for resume_path in resume_file_paths
-                }
+            on_parsed = None
+            provisional_of = {}
+            if on_result is not None:
 
-                for future in as_completed(future_to_resume):
-                    resume_path = future_to_resume[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing resume {resume_path}: {str(e)}",
-                            exc_info=True,
+                def on_parsed(resume_path, resume_data, error):
+                    if resume_data is None:
+                        result = self.error_result(resume_path, error)
+                    else:
+                        result = self.provisional_result(
+                            resume_path, resume_data, jd_data
                         )
-                        results.append(
-                            {
-                                "resume_name": resume_path.split("/")[-1],
-                                "error": str(e),
-                                "overall_score": 0,
-                            }
+                    provisional_of[id(resume_path)] = result
+                    on_result(result)
+
+            detector = self.duplicate_detector()
+            duplicates = []
+            if detector is not None:
+                resume_file_paths, duplicates = self.split_file_duplicates(
+                    resume_file_paths, detector
+                )
+
+            # Parse resumes in parallel for better performance
+            parsed, results = self.parse_resumes(resume_file_paths, on_parsed)
+
+            # File duplicates were not parsed; publish them with their original
+            if on_result is not None:
+                for resume_path, original, kind, similarity in duplicates:
+                    on_result(
+                        self.duplicate_result(
+                            resume_path,
+                            original,
+                            provisional_of.get(id(original)),
+                            kind,
+                            similarity,
                         )
+                    )
+
+            if detector is not None:
+                parsed, text_duplicates = self.split_text_duplicates(parsed, detector)
+                duplicates = self.resolve_duplicates(duplicates + text_duplicates)
+                if duplicates:
+                    logger.info(f"Found {len(duplicates)} duplicate resumes in batch")
+
+            # Skill match, text and semantic similarity for every resume in
+            # one pass each; the JD vector comes from the JD profile
+            skill_results = self.matcher.calculate_skill_matches(
+                [resume_data["skills"] for _, resume_data in parsed], jd_data["skills"]
+            )
+            resume_texts = [resume_data["text"] for _, resume_data in parsed]
+            text_similarities = self.matcher.calculate_text_similarities(
+                resume_texts, jd_data["text"]
+            )
+
+            pruned = {}
+            if min_score is None and not top_k:
+                semantic_similarities = self.matcher.calculate_semantic_similarities(
+                    resume_texts, jd_data["text"], jd_data.get("vector")
+                )
+                scored = {
+                    index: self.score_resume(
+                        resume_path,
+                        resume_data,
+                        jd_data,
+                        text_similarities[index],
+                        semantic_similarities[index],
+                        skill_results[index],
+                    )
+                    for index, (resume_path, resume_data) in enumerate(parsed)
+                }
+            else:
+                scored, pruned = self.cascade_scores(
+                    parsed,
+                    jd_data,
+                    skill_results,
+                    text_similarities,
+                    min_score,
+                    top_k,
+                )
+            # Duplicates share the result of the resume they repeat
+            result_of = {}
+            for index, result in list(scored.items()) + list(pruned.items()):
+                result_of[id(parsed[index][0])] = result
+            results.extend(scored.values())
+            pruned = list(pruned.values())
+            for resume_path, original, kind, similarity in duplicates:
+                original_result = result_of.get(id(original))
+                result = self.duplicate_result(
+                    resume_path, original, original_result, kind, similarity
+                )
+                if result.get("pruned"):
+                    pruned.append(result)
+                else:
+                    results.append(result)
 
             # Sort results by overall score (descending)
             results.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
 
-            # Add ranking
+            # Add ranking; pruned resumes follow, best bound first
+            results.extend(pruned)
             for i, result in enumerate(results):
                 result["rank"] = i + 1
 
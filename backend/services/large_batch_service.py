@@ -0,0 +1,243 @@
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from services.batch_matching_service import BatchMatchingService
+from utils.text_extractor import source_name
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSummary:
+    """Running statistics over a large batch, in constant memory"""
+
+    # Width of the overall-score histogram buckets
+    BUCKET_WIDTH = 10
+
+    def __init__(self, jd_skills):
+        self.jd_skills = jd_skills
+        self.scored = 0
+        self.failed = 0
+        self.total_score = 0.0
+        self.min_score = None
+        self.max_score = None
+        self.histogram = [0] * (100 // self.BUCKET_WIDTH)
+        self.skill_coverage = dict.fromkeys(jd_skills, 0)
+
+    def add(self, result):
+        if "error" in result:
+            self.failed += 1
+            return
+        score = result["overall_score"]
+        self.scored += 1
+        self.total_score += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        bucket = min(int(score // self.BUCKET_WIDTH), len(self.histogram) - 1)
+        self.histogram[max(bucket, 0)] += 1
+        for skill in result["matching_skills"]:
+            if skill in self.skill_coverage:
+                self.skill_coverage[skill] += 1
+
+    def to_dict(self):
+        return {
+            "scored": self.scored,
+            "failed": self.failed,
+            "mean_score": (
+                round(self.total_score / self.scored, 2) if self.scored else None
+            ),
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "score_histogram": [
+                {"from": index * self.BUCKET_WIDTH, "count": count}
+                for index, count in enumerate(self.histogram)
+            ],
+            "jd_skills": self.jd_skills,
+            "skill_coverage": self.skill_coverage,
+        }
+
+
+class LargeBatchMatchingService(BatchMatchingService):
+    """
+    Service for matching thousands of resumes against one job description.
+
+    Resumes are consumed lazily from any iterable with at most max_in_flight
+    being parsed at once. Each result is appended to a ResultStore as soon
+    as it is scored; memory holds only a top-k heap of store offsets and a
+    BatchSummary, so it stays flat however large the batch is. Duplicate
+    detection keeps its hashes, MinHash signatures and LSH buckets in a
+    scratch SQLite file next to the store (about 1 KB per resume on disk),
+    deleted when the batch ends.
+    """
+
+    def compact_result(self, result):
+        """A result without the per-candidate copies of the skill lists"""
+        result.pop("jd_skills", None)
+        result.pop("resume_skills", None)
+        return result
+
+    def score_parsed(self, resume_file_path, resume_data, jd_data):
+        """Score one parsed resume on its own"""
+        if not resume_data.get("text"):
+            return self.error_result(
+                resume_file_path, "Could not extract text from resume"
+            )
+        result = self.score_resume(resume_file_path, resume_data, jd_data)
+        result["skill_count"] = len(resume_data["skills"])
+        return result
+
+    def process_large_batch(
+        self,
+        resume_sources,
+        job_description_text,
+        store,
+        top_k=50,
+        max_in_flight=None,
+        on_progress=None,
+    ):
+        """
+        Match a stream of resumes (paths or uploads) against a job
+        description. Sources with a close() method are closed once parsed.
+        Scores use TF-IDF per resume (the pre-fitted model if configured),
+        since a batch-wide fit would need every text in memory.
+
+        Returns {"summary", "candidates"} with the top_k candidates; every
+        result is in store. on_progress(done) is called after each resume.
+        Duplicates are recorded with the original's scores and flagged as in
+        process_batch_match, but only the original counts towards the
+        summary and the top candidates.
+        """
+        detector = None
+        try:
+            jd_data = self.jd_parser.process_job_description(job_description_text)
+            summary = BatchSummary(jd_data["skills"])
+            best = []  # min-heap of (score, -sequence, offset)
+            max_in_flight = max_in_flight or self.parse_workers * 2
+            detector = self.duplicate_detector(f"{store.path}.dedup")
+            # By resume sequence number: the store offset of the result
+            # duplicates of it share (on disk), and file duplicates waiting
+            # for it to be parsed (only while it is in flight)
+            offsets = detector.result_offsets if detector is not None else None
+            waiting = {}
+
+            def record(result, key=None):
+                result = self.compact_result(result)
+                offset = store.append(result)
+                if detector is not None and key is not None:
+                    offsets[key] = offset
+                if "duplicate_of" not in result:
+                    summary.add(result)
+                    if "error" not in result:
+                        entry = (result["overall_score"], -store.count, offset)
+                        if len(best) < top_k:
+                            heapq.heappush(best, entry)
+                        elif entry > best[0]:
+                            heapq.heapreplace(best, entry)
+                if on_progress is not None:
+                    on_progress(store.count)
+                for name in waiting.pop(key, ()):
+                    record_duplicate(name, key, "file", 1.0)
+
+            def record_duplicate(name, key, kind, similarity, own_key=None):
+                if key not in offsets:
+                    waiting.setdefault(key, []).append(name)
+                    return
+                original = store.read(offsets[key])
+                if "duplicate_of" in original:
+                    # A copy of a duplicate shares its original
+                    kind = max(
+                        kind, original["duplicate_kind"], key=self.DUPLICATE_KINDS.index
+                    )
+                    similarity = min(similarity, original["duplicate_similarity"])
+                original_name = original.get("duplicate_of", original["resume_name"])
+                record(
+                    self.duplicate_result(
+                        name, original_name, original, kind, similarity
+                    ),
+                    own_key,
+                )
+
+            def close(source):
+                if hasattr(source, "close"):
+                    source.close()
+
+            sources = iter(resume_sources)
+            in_flight = {}
+            sequence = 0
+            exhausted = False
+            with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+                while True:
+                    while not exhausted and len(in_flight) < max_in_flight:
+                        source = next(sources, None)
+                        if source is None:
+                            exhausted = True
+                            break
+                        sequence += 1
+                        if detector is not None:
+                            file_hash = self.file_hash(source)
+                            key = (
+                                detector.find_content(file_hash) if file_hash else None
+                            )
+                            if key is not None:
+                                record_duplicate(source_name(source), key, "file", 1.0)
+                                close(source)
+                                continue
+                            if file_hash:
+                                detector.add_content(sequence, file_hash)
+                        future = executor.submit(self.parse_resume, source)
+                        in_flight[future] = (sequence, source)
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key, source = in_flight.pop(future)
+                        try:
+                            resume_data = future.result()
+                            match = None
+                            if detector is not None:
+                                fingerprint = self.text_fingerprint(
+                                    detector, resume_data
+                                )
+                                if fingerprint is not None:
+                                    match = detector.find_text(fingerprint)
+                                    if match is None:
+                                        detector.add_text(key, fingerprint)
+                            if match is not None:
+                                original, kind, similarity = match
+                                # Recorded under its own key, so its file
+                                # duplicates resolve through it
+                                record_duplicate(
+                                    source_name(source),
+                                    original,
+                                    kind,
+                                    similarity,
+                                    key,
+                                )
+                                continue
+                            result = self.score_parsed(source, resume_data, jd_data)
+                        except Exception as e:
+                            logger.error(
+                                f"Error processing resume {source_name(source)}: {str(e)}"
+                            )
+                            result = self.error_result(source, e)
+                        finally:
+                            close(source)
+                        record(result, key)
+
+            candidates = [
+                dict(store.read(offset), rank=rank)
+                for rank, (_, _, offset) in enumerate(
+                    sorted(best, reverse=True), start=1
+                )
+            ]
+            logger.info(
+                f"Large batch done: {summary.scored} scored, {summary.failed} failed"
+            )
+            return {"summary": summary.to_dict(), "candidates": candidates}
+        except Exception as e:
+            logger.error(f"Error processing large batch: {str(e)}", exc_info=True)
+            raise e
+        finally:
+            if detector is not None:
+                detector.close()
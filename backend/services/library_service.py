@@ -0,0 +1,118 @@
+import logging
+
+from services.batch_matching_service import BatchMatchingService
+from utils.dedup import MinHasher
+from utils.text_extractor import source_name
+
+logger = logging.getLogger(__name__)
+
+
+class LibraryService(BatchMatchingService):
+    """Service for adding resumes to the candidate library and searching it"""
+
+    def __init__(
+        self,
+        resume_parser,
+        jd_parser,
+        matcher,
+        library,
+        resume_cache=None,
+        parse_pool=None,
+        duplicate_threshold=None,
+    ):
+        super().__init__(
+            resume_parser,
+            jd_parser,
+            matcher,
+            resume_cache,
+            parse_pool,
+            duplicate_threshold,
+        )
+        self.library = library
+        self.hasher = MinHasher()
+
+    def duplicate_entry(self, name, candidate_id, kind, similarity):
+        return {
+            "resume_name": name,
+            "candidate_id": candidate_id,
+            "duplicate_of": candidate_id,
+            "duplicate_kind": kind,
+            "duplicate_similarity": similarity,
+        }
+
+    def add_resumes(self, resume_file_paths):
+        """
+        Parse resumes and store them in the library. Resumes already stored
+        (same file, or with duplicate detection on the same or near-identical
+        text) are not stored again and are reported with duplicate_of.
+        """
+        results = []
+        # Files already in the library are not parsed again
+        new_paths = []
+        hashes = {}
+        for resume_path in resume_file_paths:
+            content_hash = self.file_hash(resume_path)
+            candidate_id = (
+                self.library.find_content(content_hash) if content_hash else None
+            )
+            if candidate_id is None:
+                hashes[id(resume_path)] = content_hash
+                new_paths.append(resume_path)
+            else:
+                results.append(
+                    self.duplicate_entry(
+                        source_name(resume_path), candidate_id, "file", 1.0
+                    )
+                )
+
+        parsed, errors = self.parse_resumes(new_paths)
+        for resume_path, resume_data in parsed:
+            name = source_name(resume_path)
+            try:
+                if not resume_data.get("text"):
+                    raise ValueError("Could not extract text from resume")
+                fingerprint = None
+                if self.duplicate_threshold is not None:
+                    fingerprint = self.hasher.fingerprint(
+                        self.resume_parser.preprocess_text(resume_data["text"])
+                    )
+                candidate_id, duplicate = self.library.add(
+                    name, resume_data, hashes.get(id(resume_path)), fingerprint
+                )
+                if duplicate is not None:
+                    results.append(
+                        self.duplicate_entry(
+                            name,
+                            candidate_id,
+                            duplicate["kind"],
+                            duplicate["similarity"],
+                        )
+                    )
+                    continue
+                results.append(
+                    {
+                        "resume_name": name,
+                        "candidate_id": candidate_id,
+                        "skills": resume_data["skills"],
+                    }
+                )
+            except Exception as e:
+                logger.error(f"Error adding resume {name} to library: {str(e)}")
+                errors.append({"resume_name": name, "error": str(e)})
+        for error in errors:
+            results.append(
+                {"resume_name": error["resume_name"], "error": error["error"]}
+            )
+        return results
+
+    def search(self, job_description_text, top_k=10):
+        """Top-k library candidates for a job description"""
+        try:
+            jd_data = self.jd_parser.process_job_description(job_description_text)
+            return {
+                "jd_skills": jd_data["skills"],
+                "candidates": self.library.search(jd_data, top_k),
+            }
+        except Exception as e:
+            logger.error(f"Error searching candidate library: {str(e)}", exc_info=True)
+            raise e
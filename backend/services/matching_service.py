@@ -7,10 +7,17 @@ logger = logging.getLogger(__name__)
 class MatchingService:
     """Service for handling resume-job matching operations"""
 
-    def __init__(self, resume_parser, jd_parser, matcher):
+    def __init__(self, resume_parser, jd_parser, matcher, resume_cache=None):
         self.resume_parser = resume_parser
         self.jd_parser = jd_parser
         self.matcher = matcher
+        self.resume_cache = resume_cache
+
+    def parse_resume(self, resume_file_path):
+        """Parse a resume, going through the parsed-resume cache if configured"""
+        if self.resume_cache is not None:
+            return self.resume_cache.get_or_parse(resume_file_path, self.resume_parser)
+        return self.resume_parser.process_resume(resume_file_path)
 
     def process_match(self, resume_file_path, job_description_text):
         """Process a resume and job description to calculate match"""
@@ -31,7 +38,7 @@ class MatchingService:
 
             # Parse resume
             try:
-                resume_data = self.resume_parser.process_resume(resume_file_path)
+                resume_data = self.parse_resume(resume_file_path)
                 if not resume_data["text"]:
                     raise ValueError("Could not extract text from resume")
                 if not resume_data["skills"]:
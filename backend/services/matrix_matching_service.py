@@ -0,0 +1,160 @@
+import logging
+
+from services.batch_matching_service import BatchMatchingService
+from utils.matcher import SEMANTIC_WEIGHT, SKILL_WEIGHT, TEXT_WEIGHT
+from utils.ranking import top_indices
+from utils.text_extractor import source_name
+
+logger = logging.getLogger(__name__)
+
+
+class MatchMatrix:
+    """Score matrices (resumes x jobs) for a pool of resumes and job descriptions"""
+
+    def __init__(self, resumes, jobs, skill, text, semantic, errors):
+        self.resumes = resumes  # [(resume source, resume_data)]
+        self.jobs = jobs  # [jd_data]
+        self.skill = skill
+        self.text = text
+        self.semantic = semantic
+        self.errors = errors
+        self.overall = (
+            SKILL_WEIGHT * skill + TEXT_WEIGHT * text + SEMANTIC_WEIGHT * semantic
+        )
+
+    @property
+    def shape(self):
+        return self.overall.shape
+
+
+class MatrixMatchingService(BatchMatchingService):
+    """
+    Service for matching a pool of resumes against several job descriptions.
+
+    Every resume and JD is parsed once; skill overlap, TF-IDF and semantic
+    scores for all N x M pairs come from vectorised matrix operations.
+    """
+
+    def parse_job_descriptions(self, job_description_texts):
+        """Parse each job description once (through the JD profile cache)"""
+        return [
+            self.jd_parser.process_job_description(text)
+            for text in job_description_texts
+        ]
+
+    def score_matrix(self, resume_file_paths, job_description_texts):
+        """Parse everything once and compute the N x M score matrices"""
+        jobs = self.parse_job_descriptions(job_description_texts)
+        parsed, errors = self.parse_resumes(resume_file_paths)
+
+        # Resumes without text would only add rows of zeros to every ranking
+        resumes = []
+        for resume_path, resume_data in parsed:
+            if resume_data.get("text"):
+                resumes.append((resume_path, resume_data))
+            else:
+                errors.append(
+                    self.error_result(resume_path, "Could not extract text from resume")
+                )
+        logger.info(f"Scoring {len(resumes)} resumes against {len(jobs)} jobs")
+
+        resume_texts = [resume_data["text"] for _, resume_data in resumes]
+        jd_texts = [jd_data["text"] for jd_data in jobs]
+
+        skill = self.matcher.calculate_skill_match_matrix(
+            [resume_data["skills"] for _, resume_data in resumes],
+            [jd_data["skills"] for jd_data in jobs],
+        )
+        text = self.matcher.calculate_text_similarity_matrix(resume_texts, jd_texts)
+        semantic = self.matcher.calculate_semantic_similarity_matrix(
+            resume_texts, jd_texts, [jd_data.get("vector") for jd_data in jobs]
+        )
+        return MatchMatrix(resumes, jobs, skill, text, semantic, errors)
+
+    def pair_result(self, matrix, resume_index, job_index):
+        """Scores and skill breakdown for one resume/JD pair"""
+        resume_path, resume_data = matrix.resumes[resume_index]
+        jd_skills = matrix.jobs[job_index]["skills"]
+        _, matching_skills = self.matcher.calculate_skill_match(
+            resume_data["skills"], jd_skills
+        )
+        return {
+            "resume_index": resume_index,
+            "resume_name": source_name(resume_path),
+            "job_index": job_index,
+            "overall_score": round(float(matrix.overall[resume_index, job_index]), 2),
+            "skill_match": round(float(matrix.skill[resume_index, job_index]), 2),
+            "text_similarity": round(float(matrix.text[resume_index, job_index]), 2),
+            "semantic_similarity": round(
+                float(matrix.semantic[resume_index, job_index]), 2
+            ),
+            "matching_skills": matching_skills,
+            "missing_skills": self.matcher.get_missing_skills(
+                resume_data["skills"], jd_skills
+            ),
+        }
+
+    def iter_results(self, resume_file_paths, job_description_texts, top_k=5):
+        """
+        Yield JSON-ready records: a summary, then the top_k candidates for
+        each job, then the top_k jobs for each candidate, then any resumes
+        that failed to parse. Suited to streaming large matrices.
+        """
+        matrix = self.score_matrix(resume_file_paths, job_description_texts)
+        n_resumes, n_jobs = matrix.shape
+
+        yield {
+            "type": "summary",
+            "resumes": n_resumes,
+            "jobs": n_jobs,
+            "failed": len(matrix.errors),
+            "top_k": top_k,
+        }
+
+        for job_index in range(n_jobs):
+            yield {
+                "type": "job",
+                "job_index": job_index,
+                "jd_skills": matrix.jobs[job_index]["skills"],
+                "candidates": [
+                    self.pair_result(matrix, resume_index, job_index)
+                    for resume_index in top_indices(matrix.overall[:, job_index], top_k)
+                ],
+            }
+
+        for resume_index in range(n_resumes):
+            resume_path, resume_data = matrix.resumes[resume_index]
+            yield {
+                "type": "candidate",
+                "resume_index": resume_index,
+                "resume_name": source_name(resume_path),
+                "contact_info": resume_data.get("contact_info", {}),
+                "jobs": [
+                    self.pair_result(matrix, resume_index, job_index)
+                    for job_index in top_indices(matrix.overall[resume_index], top_k)
+                ],
+            }
+
+        for error in matrix.errors:
+            yield dict(error, type="error")
+
+    def process_matrix_match(self, resume_file_paths, job_description_texts, top_k=5):
+        """Match N resumes against M job descriptions, ranked both ways"""
+        try:
+            result = {"jobs": [], "candidates": [], "errors": []}
+            for record in self.iter_results(
+                resume_file_paths, job_description_texts, top_k
+            ):
+                record_type = record.pop("type")
+                if record_type == "summary":
+                    result["summary"] = record
+                elif record_type == "job":
+                    result["jobs"].append(record)
+                elif record_type == "candidate":
+                    result["candidates"].append(record)
+                else:
+                    result["errors"].append(record)
+            return result
+        except Exception as e:
+            logger.error(f"Error processing matrix match: {str(e)}", exc_info=True)
+            raise e
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from utils.resume_parser import ResumeParser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return ResumeParser(Config.SKILLS_DB_PATH, Config.NLP_MODEL)
+
+
+def org(text, name):
+    start = text.index(name)
+    return SimpleNamespace(
+        label_="ORG", text=name, start_char=start, end_char=start + len(name)
+    )
+
+
+def test_title_straddling_window_start(parser):
+    # The entity window starts one character into "Senior Software
+    # Engineer"; scanning the window finds "Software Engineer"
+    text = (
+        "Senior Software Engineer, Initech 2015\n"
+        + "x" * 111
+        + "\nAcme Corp\nJan 2019 - Present"
+    )
+    doc = SimpleNamespace(ents=[org(text, "Acme Corp")])
+
+    entries = parser.extract_work_experience(text, doc)
+
+    assert len(entries) == 1
+    assert entries[0]["company"] == "Acme Corp"
+    assert entries[0]["title"] == "Software Engineer"
+    assert entries[0]["date_range"] == "Jan 2019 - Present"
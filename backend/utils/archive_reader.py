@@ -0,0 +1,232 @@
+import logging
+import os
+import tarfile
+import zipfile
+import zlib
+
+from utils.file_handler import SpooledUpload
+from utils.text_extractor import SUPPORTED_EXTENSIONS, source_extension
+
+logger = logging.getLogger(__name__)
+
+# Bytes decompressed per read while copying a member out
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ArchiveError(ValueError):
+    """The archive is unreadable or exceeds a limit; ingestion stops"""
+
+
+def archive_format(filename):
+    """Archive type of a filename: "zip", "tar" (also .tar.gz/.tgz) or None"""
+    name = (filename or "").lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar", ".tar.gz", ".tgz")):
+        return "tar"
+    return None
+
+
+class ArchiveReader:
+    """
+    Streams resumes out of a ZIP or tar(.gz) archive one member at a time.
+
+    Each supported member is decompressed into its own SpooledUpload (in
+    memory unless large) only when the consumer asks for the next one, so
+    nothing is extracted to disk up front. Guards against zip bombs: a
+    member count limit, a per-member size limit enforced on the bytes
+    actually decompressed, a total decompressed size limit and a maximum
+    compression ratio (per member for ZIP, over the archive for tar). A tar
+    stream has to decompress skipped members to move past them, so their
+    sizes count towards the total too. Members that cannot be used are
+    skipped and listed in skipped; hitting an archive-wide limit stops
+    iteration early and sets error, so resumes already read are still
+    processed.
+
+    Opening checks the ZIP directory (and member count) or the first tar
+    header; the other limits are enforced while iterating.
+    """
+
+    def __init__(
+        self,
+        stream,
+        filename,
+        max_members=5000,
+        max_member_size=5 * 1024 * 1024,
+        max_total_size=1024 * 1024 * 1024,
+        max_ratio=100,
+        spool_threshold=1024 * 1024,
+    ):
+        self.format = archive_format(filename)
+        if self.format is None:
+            raise ArchiveError(f"Unsupported archive format: {filename}")
+        self.stream = stream
+        self.filename = filename
+        self.max_members = max_members
+        self.max_member_size = max_member_size
+        self.max_total_size = max_total_size
+        self.max_ratio = max_ratio
+        self.spool_threshold = spool_threshold
+        self.members = 0
+        self.total_size = 0
+        self.skipped = []
+        self.error = None
+        self._zip = None
+
+        if self.format == "zip":
+            try:
+                self._zip = zipfile.ZipFile(stream)
+            except zipfile.BadZipFile as e:
+                raise ArchiveError(f"Invalid ZIP archive: {e}")
+            entries = self._zip.infolist()
+            if len(entries) > max_members:
+                raise ArchiveError(
+                    f"Archive has {len(entries)} members (limit {max_members})"
+                )
+        else:
+            try:
+                stream.seek(0)
+                with tarfile.open(fileobj=stream, mode="r|*") as archive:
+                    archive.next()
+            except tarfile.TarError as e:
+                raise ArchiveError(f"Invalid tar archive: {e}")
+
+    @property
+    def total(self):
+        """Resumes the archive may yield, if known before reading (ZIP only)"""
+        if self._zip is None:
+            return None
+        return sum(
+            1
+            for info in self._zip.infolist()
+            if not info.is_dir() and self.check_member(info.filename) is None
+        )
+
+    def skip(self, name, reason):
+        logger.warning(f"Skipping archive member {name}: {reason}")
+        self.skipped.append({"name": name, "reason": reason})
+
+    def check_member(self, name):
+        """Skip reason for a member name, or None if it should be read"""
+        base = os.path.basename(name)
+        if not base or base.startswith(".") or name.startswith("__MACOSX/"):
+            return "hidden or system file"
+        if source_extension(base) not in SUPPORTED_EXTENSIONS:
+            return "unsupported file type"
+        return None
+
+    def add_total(self, size):
+        """Count decompressed bytes towards the archive-wide limit"""
+        self.total_size += size
+        if self.total_size > self.max_total_size:
+            raise ArchiveError(
+                f"Archive expands past {self.max_total_size} bytes; stopped"
+            )
+
+    def check_stream_ratio(self):
+        """
+        Stop a tar whose decompressed size so far is over max_ratio times
+        the compressed bytes read. Only checked past one member's size
+        limit, so archives of a few tiny, highly compressible files pass.
+        """
+        compressed = self.stream.tell()
+        if (
+            self.total_size > self.max_member_size
+            and compressed
+            and self.total_size / compressed > self.max_ratio
+        ):
+            raise ArchiveError("Suspicious archive compression ratio; stopped")
+
+    def copy_member(self, name, member_stream, counted=False):
+        """
+        Decompress one member into a SpooledUpload, enforcing size limits.
+        counted means its size is already in total_size (tar headers).
+        """
+        # The name is only displayed and used for the format; never a path
+        upload = SpooledUpload(os.path.basename(name), self.spool_threshold)
+        size = 0
+        while True:
+            chunk = member_stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if not counted:
+                try:
+                    self.add_total(len(chunk))
+                except ArchiveError:
+                    upload.close()
+                    raise
+            if size > self.max_member_size:
+                upload.close()
+                self.skip(name, f"larger than {self.max_member_size} bytes")
+                return None
+            upload.stream.write(chunk)
+        upload.seek(0)
+        return upload
+
+    def __iter__(self):
+        try:
+            if self.format == "zip":
+                yield from self._iter_zip()
+            else:
+                yield from self._iter_tar()
+        except ArchiveError as e:
+            logger.error(f"Stopped reading archive {self.filename}: {e}")
+            self.error = str(e)
+
+    def _iter_zip(self):
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            self.members += 1
+            reason = self.check_member(info.filename)
+            if reason is None and info.flag_bits & 0x1:
+                reason = "encrypted"
+            if reason is None and info.compress_size:
+                if info.file_size / info.compress_size > self.max_ratio:
+                    reason = "suspicious compression ratio"
+            if reason is not None:
+                self.skip(info.filename, reason)
+                continue
+            try:
+                with self._zip.open(info) as member_stream:
+                    upload = self.copy_member(info.filename, member_stream)
+            except (zipfile.BadZipFile, zlib.error, NotImplementedError) as e:
+                self.skip(info.filename, f"unreadable: {e}")
+                continue
+            if upload is not None:
+                yield upload
+
+    def _iter_tar(self):
+        try:
+            # Stream mode: members are read sequentially, no seeking back
+            self.stream.seek(0)
+            with tarfile.open(fileobj=self.stream, mode="r|*") as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    self.members += 1
+                    if self.members > self.max_members:
+                        raise ArchiveError(
+                            f"Archive has more than {self.max_members} members"
+                        )
+                    # Skipped members are decompressed too, to reach the next
+                    self.add_total(member.size)
+                    self.check_stream_ratio()
+                    reason = self.check_member(member.name)
+                    if reason is None and member.size > self.max_member_size:
+                        reason = f"larger than {self.max_member_size} bytes"
+                    if reason is not None:
+                        self.skip(member.name, reason)
+                        continue
+                    upload = self.copy_member(
+                        member.name, archive.extractfile(member), counted=True
+                    )
+                    if upload is not None:
+                        yield upload
+        except tarfile.TarError as e:
+            raise ArchiveError(f"Invalid tar archive: {e}")
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
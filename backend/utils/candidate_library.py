@@ -0,0 +1,508 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from utils.dedup import LSHIndex
+from utils.matcher import (
+    MAX_TFIDF_TEXT_LENGTH,
+    SEMANTIC_WEIGHT,
+    SKILL_WEIGHT,
+    TEXT_WEIGHT,
+)
+from utils.ranking import top_indices
+from utils.skill_vectors import SkillVectorizer
+from utils.skills_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+# Rows added since the last merge are kept in a small TF-IDF tail block,
+# stacked into the main matrix once it has this many
+TFIDF_MERGE_ROWS = 256
+
+
+class LibraryIndex:
+    """
+    In-memory search structures over every candidate in the library:
+    skill postings (skill ID -> candidate rows), a TF-IDF matrix and a
+    matrix of unit-length document vectors.
+
+    Candidates are added and removed in place: a new candidate is appended
+    as one row and a removed one is masked out, so neither touches the
+    rest of the index. TF-IDF rows come from the shared pre-fitted model,
+    else from a vectorizer fitted on the library when the index was built
+    and then kept fixed, so stored candidates' scores do not shift on every
+    add (see needs_rebuild for when it is refitted).
+    """
+
+    def __init__(self, ids, skills, texts, vectors, taxonomy, tfidf_model=None):
+        self.taxonomy_version = taxonomy.version
+        self.vectorizer = SkillVectorizer(taxonomy)
+        self.prefitted = tfidf_model is not None
+        self.ids = list(ids)
+        self.row_of = {candidate_id: row for row, candidate_id in enumerate(ids)}
+        self.removed = 0
+
+        # Inverted index: skill ID -> candidate rows, in row order
+        self.postings = {}
+        for row, candidate_skills in enumerate(skills):
+            self._post(row, candidate_skills)
+        self._posting_arrays = {}
+
+        # TF-IDF rows: the shared pre-fitted model, else one fitted on the
+        # library so query scores stay comparable between searches
+        texts = [text[:MAX_TFIDF_TEXT_LENGTH] for text in texts]
+        self.fitted_rows = len(texts)
+        if tfidf_model is not None:
+            self.tfidf = tfidf_model
+        elif texts:
+            self.tfidf = TfidfVectorizer().fit(texts)
+        else:
+            self.tfidf = None
+        self._tfidf_blocks = []
+        if self.tfidf is not None and texts:
+            self._tfidf_blocks.append(self.tfidf.transform(texts).tocsr())
+        self._tfidf_pending = []
+
+        # Unit-length document vectors, so cosines are a single mat-vec;
+        # allocated with spare rows so adds rarely copy the matrix
+        self._vectors = None
+        self._alive = np.ones(max(len(self.ids), 1), dtype=bool)
+        if len(vectors):
+            self._reserve(len(self.ids), vectors.shape[1])
+            self._vectors[: len(self.ids)] = self._unit(vectors)
+
+    def __len__(self):
+        return len(self.ids) - self.removed
+
+    @staticmethod
+    def _unit(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _reserve(self, rows, dimensions):
+        """Grow the row arrays (doubling) to hold at least rows rows"""
+        if self._vectors is None:
+            self._vectors = np.zeros((max(rows, 16), dimensions), dtype=np.float32)
+        elif rows > len(self._vectors):
+            grown = np.zeros(
+                (max(rows, 2 * len(self._vectors)), dimensions), dtype=np.float32
+            )
+            grown[: len(self._vectors)] = self._vectors
+            self._vectors = grown
+        if rows > len(self._alive):
+            alive = np.zeros(max(rows, 2 * len(self._alive)), dtype=bool)
+            alive[: len(self._alive)] = self._alive
+            self._alive = alive
+
+    def _post(self, row, candidate_skills):
+        for skill_id in set(self.vectorizer.ids(candidate_skills).tolist()):
+            self.postings.setdefault(skill_id, []).append(row)
+
+    def add(self, candidate_id, skills, text, vector):
+        """Append one candidate"""
+        row = len(self.ids)
+        self.ids.append(candidate_id)
+        self.row_of[candidate_id] = row
+        self._post(row, skills)
+        for skill_id in set(self.vectorizer.ids(skills).tolist()):
+            self._posting_arrays.pop(skill_id, None)
+        if self.tfidf is not None:
+            self._tfidf_pending.append(
+                self.tfidf.transform([text[:MAX_TFIDF_TEXT_LENGTH]]).tocsr()
+            )
+        vector = np.asarray(vector, dtype=np.float32)
+        self._reserve(row + 1, len(vector))
+        self._alive[row] = True
+        self._vectors[row] = self._unit(vector)
+
+    def remove(self, candidate_id):
+        """Mask out one candidate; its row is dropped at the next rebuild"""
+        row = self.row_of.pop(candidate_id, None)
+        if row is not None:
+            self._alive[row] = False
+            self.removed += 1
+
+    def needs_rebuild(self, taxonomy_version):
+        """
+        Whether to rebuild from storage: the taxonomy changed, most rows are
+        removed, or (without a pre-fitted model) the library has doubled
+        since the TF-IDF vectorizer was fitted. Doubling keeps refits
+        amortized to a constant cost per add.
+        """
+        if taxonomy_version != self.taxonomy_version:
+            return True
+        if self.removed > len(self):
+            return True
+        return not self.prefitted and len(self) >= 2 * self.fitted_rows
+
+    @property
+    def alive(self):
+        """Mask of rows that are still in the library"""
+        return self._alive[: len(self.ids)]
+
+    def skill_scores(self, jd_skills):
+        """Skill match percentage of every row, from the postings"""
+        overlap = np.zeros(len(self.ids), dtype=np.int64)
+        if not jd_skills or not self.ids:
+            return overlap.astype(np.float64)
+        for skill_id in set(self.vectorizer.ids(jd_skills).tolist()):
+            rows = self._posting_arrays.get(skill_id)
+            if rows is None:
+                if skill_id not in self.postings:
+                    continue
+                rows = np.asarray(self.postings[skill_id], dtype=np.int64)
+                self._posting_arrays[skill_id] = rows
+            overlap[rows] += 1
+        return overlap / len(jd_skills) * 100
+
+    def text_scores(self, jd_text):
+        """TF-IDF cosine percentage of every row"""
+        if self.tfidf is None or not self.ids:
+            return np.zeros(len(self.ids))
+        if self._tfidf_pending:
+            # Recent rows go into a small tail block, merged when it fills
+            tail = self._tfidf_pending
+            if len(self._tfidf_blocks) > 1:
+                tail = [self._tfidf_blocks.pop()] + tail
+            self._tfidf_blocks.append(sparse.vstack(tail).tocsr())
+            self._tfidf_pending = []
+            if self._tfidf_blocks[-1].shape[0] >= TFIDF_MERGE_ROWS:
+                self._tfidf_blocks = [sparse.vstack(self._tfidf_blocks).tocsr()]
+        query = self.tfidf.transform([jd_text[:MAX_TFIDF_TEXT_LENGTH]])
+        return (
+            np.concatenate(
+                [(block @ query.T).toarray().ravel() for block in self._tfidf_blocks]
+            )
+            * 100
+        )
+
+    def semantic_scores(self, jd_vector):
+        """Document-vector cosine percentage of every row"""
+        if jd_vector is None or self._vectors is None or not self.ids:
+            return np.zeros(len(self.ids))
+        jd_vector = np.asarray(jd_vector, dtype=np.float32)
+        norm = np.linalg.norm(jd_vector)
+        if not norm:
+            return np.zeros(len(self.ids))
+        return self._vectors[: len(self.ids)] @ (jd_vector / norm) * 100
+
+
+class CandidateLibrary:
+    """
+    Persistent library of parsed resumes that can be searched by job
+    description without re-parsing anything.
+
+    Candidates live in SQLite (parsed data, skills, text and document
+    vector). A LibraryIndex over all of them is built on first search and
+    then updated in place on add and remove; it is rebuilt from SQLite only
+    when LibraryIndex.needs_rebuild says so.
+
+    With a duplicate_threshold, resumes carrying a TextFingerprint are also
+    checked against the stored text hashes and an LSH index of MinHash
+    signatures, so copies in another format or lightly edited versions
+    are not stored twice. The LSH index is loaded once and kept up to date
+    on add and remove; candidates stored without a fingerprint are not in
+    it.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        vector_service,
+        tfidf_model=None,
+        duplicate_threshold=None,
+        skills_db_path=None,
+    ):
+        self.db_path = db_path
+        # Skills file resumes were parsed with; postings use its skill IDs
+        self.skills_db_path = skills_db_path
+        self.vector_service = vector_service
+        self.tfidf_model = tfidf_model
+        self.duplicate_threshold = duplicate_threshold
+        self._lock = Lock()
+        self._index = None
+        self._lsh = None
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+            "content_hash TEXT UNIQUE, skills TEXT NOT NULL, text TEXT NOT NULL, "
+            "data TEXT NOT NULL, vector BLOB, created_at REAL)"
+        )
+        # Duplicate-detection columns, added to libraries created before them
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(candidates)")}
+        for column, column_type in (("text_hash", "TEXT"), ("minhash", "BLOB")):
+            if column not in columns:
+                self._db.execute(
+                    f"ALTER TABLE candidates ADD COLUMN {column} {column_type}"
+                )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS candidates_text_hash ON candidates (text_hash)"
+        )
+        self._db.commit()
+        logger.info(f"Candidate library at {db_path}: {len(self)} candidates")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def find_content(self, content_hash):
+        """ID of the candidate stored from identical file bytes, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _duplicate_index(self):
+        """LSHIndex of stored MinHash signatures; call with the lock held"""
+        if self._lsh is None:
+            start = time.perf_counter()
+            self._lsh = LSHIndex()
+            for candidate_id, minhash in self._db.execute(
+                "SELECT id, minhash FROM candidates WHERE minhash IS NOT NULL"
+            ):
+                self._lsh.add(candidate_id, np.frombuffer(minhash, dtype=np.uint32))
+            logger.info(
+                f"Built duplicate index over {len(self._lsh)} candidates in "
+                f"{time.perf_counter() - start:.2f}s"
+            )
+        return self._lsh
+
+    def _find_duplicate(self, content_hash, fingerprint):
+        """(id, kind, similarity) of a stored duplicate, or None; lock held"""
+        if content_hash is not None:
+            row = self._db.execute(
+                "SELECT id FROM candidates WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is not None:
+                return row[0], "file", 1.0
+        if fingerprint is None or self.duplicate_threshold is None:
+            return None
+        row = self._db.execute(
+            "SELECT id FROM candidates WHERE text_hash = ?", (fingerprint.text_hash,)
+        ).fetchone()
+        if row is not None:
+            return row[0], "text", 1.0
+        match = self._duplicate_index().query(
+            fingerprint.signature, self.duplicate_threshold
+        )
+        if match is not None:
+            return match[0], "near", round(match[1], 3)
+        return None
+
+    def add(self, name, resume_data, content_hash=None, fingerprint=None):
+        """
+        Store a parsed resume. Returns (candidate ID, duplicate): a resume
+        that duplicates a stored one (same content hash, or with a
+        TextFingerprint the same or near-identical text) is not stored and
+        returns the existing ID with duplicate = {"kind", "similarity"};
+        otherwise duplicate is None. Only new candidates are vectorized.
+        """
+        with self._lock:
+            match = self._find_duplicate(content_hash, fingerprint)
+        if match is None:
+            vector = self.vector_service.vector(resume_data["text"])
+        with self._lock:
+            # Checked again in case another add stored it meanwhile
+            if match is None:
+                match = self._find_duplicate(content_hash, fingerprint)
+            if match is not None:
+                candidate_id, kind, similarity = match
+                return candidate_id, {"kind": kind, "similarity": similarity}
+            cursor = self._db.execute(
+                "INSERT INTO candidates "
+                "(name, content_hash, skills, text, data, vector, created_at, "
+                "text_hash, minhash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    content_hash,
+                    json.dumps(resume_data["skills"]),
+                    resume_data["text"],
+                    json.dumps(resume_data),
+                    np.asarray(vector, dtype=np.float32).tobytes(),
+                    time.time(),
+                    fingerprint.text_hash if fingerprint is not None else None,
+                    (
+                        fingerprint.signature.tobytes()
+                        if fingerprint is not None
+                        else None
+                    ),
+                ),
+            )
+            self._db.commit()
+            if self._index is not None:
+                self._index.add(
+                    cursor.lastrowid, resume_data["skills"], resume_data["text"], vector
+                )
+            if fingerprint is not None and self._lsh is not None:
+                self._lsh.add(cursor.lastrowid, fingerprint.signature)
+            return cursor.lastrowid, None
+
+    def remove(self, candidate_id):
+        """Delete a candidate; returns False if it did not exist"""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM candidates WHERE id = ?", (candidate_id,)
+            )
+            self._db.commit()
+            if cursor.rowcount:
+                if self._index is not None:
+                    self._index.remove(candidate_id)
+                if self._lsh is not None:
+                    self._lsh.remove(candidate_id)
+            return bool(cursor.rowcount)
+
+    def get(self, candidate_id):
+        """Stored parsed resume for a candidate, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, name, data, created_at FROM candidates WHERE id = ?",
+                (candidate_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "name": row[1],
+            "resume": json.loads(row[2]),
+            "created_at": row[3],
+        }
+
+    def list(self, offset=0, limit=50):
+        """Candidate summaries, newest first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, name, skills, created_at FROM candidates "
+                "ORDER BY id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [
+            {
+                "id": candidate_id,
+                "name": name,
+                "skills": json.loads(skills),
+                "created_at": created_at,
+            }
+            for candidate_id, name, skills, created_at in rows
+        ]
+
+    def _load_rows(self, candidate_ids):
+        """id -> (name, data) for a handful of candidates"""
+        if not candidate_ids:
+            return {}
+        placeholders = ",".join("?" * len(candidate_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, name, data FROM candidates WHERE id IN ({placeholders})",
+                candidate_ids,
+            ).fetchall()
+        return {row[0]: (row[1], json.loads(row[2])) for row in rows}
+
+    def index(self):
+        """Current LibraryIndex, rebuilt if needed"""
+        taxonomy = get_taxonomy(self.skills_db_path).snapshot()
+        with self._lock:
+            return self._current_index(taxonomy)
+
+    def _current_index(self, taxonomy):
+        """The LibraryIndex, rebuilt from SQLite if needed; lock held"""
+        index = self._index
+        if index is None or index.needs_rebuild(taxonomy.version):
+            start = time.perf_counter()
+            ids, skills, texts, vectors = [], [], [], []
+            for candidate_id, skill_json, text, vector in self._db.execute(
+                "SELECT id, skills, text, vector FROM candidates ORDER BY id"
+            ):
+                ids.append(candidate_id)
+                skills.append(json.loads(skill_json))
+                texts.append(text)
+                vectors.append(np.frombuffer(vector, dtype=np.float32))
+            matrix = (
+                np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+            )
+            index = LibraryIndex(ids, skills, texts, matrix, taxonomy, self.tfidf_model)
+            self._index = index
+            logger.info(
+                f"Built candidate index over {len(index)} candidates in "
+                f"{time.perf_counter() - start:.2f}s"
+            )
+        return index
+
+    def search(self, jd_data, top_k=10):
+        """
+        Top-k library candidates for a processed job description
+        (see JobDescriptionParser.process_job_description).
+        """
+        jd_vector = jd_data.get("vector")
+        if jd_vector is None:
+            jd_vector = self.vector_service.vector(jd_data["text"])
+
+        taxonomy = get_taxonomy(self.skills_db_path).snapshot()
+        # Scored under the lock, since adds and removes update the index
+        with self._lock:
+            index = self._current_index(taxonomy)
+            skill = index.skill_scores(jd_data["skills"])
+            text = index.text_scores(jd_data["text"])
+            semantic = index.semantic_scores(jd_vector)
+            alive = index.alive.copy()
+            ids = list(index.ids)
+        overall = SKILL_WEIGHT * skill + TEXT_WEIGHT * text + SEMANTIC_WEIGHT * semantic
+
+        rows = [
+            row
+            for row in top_indices(np.where(alive, overall, -np.inf), top_k)
+            if alive[row]
+        ]
+        stored = self._load_rows([ids[row] for row in rows])
+
+        results = []
+        for row in rows:
+            candidate_id = ids[row]
+            if candidate_id not in stored:
+                continue  # Removed since it was scored
+            name, resume_data = stored[candidate_id]
+            resume_skills_lower = {s.lower() for s in resume_data["skills"]}
+            results.append(
+                {
+                    "rank": len(results) + 1,
+                    "candidate_id": candidate_id,
+                    "resume_name": name,
+                    "contact_info": resume_data.get("contact_info", {}),
+                    "overall_score": round(float(overall[row]), 2),
+                    "skill_match": round(float(skill[row]), 2),
+                    "text_similarity": round(float(text[row]), 2),
+                    "semantic_similarity": round(float(semantic[row]), 2),
+                    "matching_skills": [
+                        s for s in jd_data["skills"] if s.lower() in resume_skills_lower
+                    ],
+                    "missing_skills": [
+                        s
+                        for s in jd_data["skills"]
+                        if s.lower() not in resume_skills_lower
+                    ],
+                }
+            )
+        return results
+
+    def stats(self):
+        index = self._index
+        return {
+            "candidates": len(self),
+            "indexed": len(index) if index is not None else 0,
+            "skills_indexed": len(index.postings) if index is not None else 0,
+            "duplicate_index": len(self._lsh) if self._lsh is not None else 0,
+        }
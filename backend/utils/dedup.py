@@ -0,0 +1,330 @@
+"""
+Duplicate and near-duplicate resume detection.
+
+Exact duplicates are found by hashing the file bytes (same file) or the
+normalized word sequence (same text in another format, e.g. PDF and
+DOCX). Near duplicates, such as lightly edited copies, are found with
+MinHash signatures over word shingles, indexed by locality-sensitive
+hashing so a lookup only compares against resumes sharing a band.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Modulus of the MinHash permutations (a prime above 2**32)
+MINHASH_PRIME = np.uint64(4294967311)
+
+
+def normalized_words(normalized_text):
+    """Word tokens of preprocessed text, ignoring punctuation and layout"""
+    return WORD_PATTERN.findall(normalized_text)
+
+
+def content_hash(content):
+    """SHA-256 of raw file bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class TextFingerprint:
+    """
+    Exact-text hash and MinHash signature of one resume. The signature is
+    computed on first use, so a text found by its hash never pays for it.
+    """
+
+    def __init__(self, text_hash, words, hasher):
+        self.text_hash = text_hash
+        self._words = words
+        self._hasher = hasher
+        self._signature = None
+
+    @property
+    def signature(self):
+        if self._signature is None:
+            self._signature = self._hasher.signature(self._words)
+            self._words = None
+        return self._signature
+
+
+class MinHasher:
+    """
+    MinHash signatures of word-shingle sets. Shingles are hashed with
+    CRC32 and permuted with (a * h + b) mod p, so signatures are stable
+    across processes and can be stored.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 2**31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, 2**31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def shingle_hashes(self, words):
+        """uint64 CRC32 hashes of the distinct word shingles"""
+        if len(words) < SHINGLE_SIZE:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {
+                " ".join(words[index : index + SHINGLE_SIZE])
+                for index in range(len(words) - SHINGLE_SIZE + 1)
+            }
+        return np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+
+    def signature(self, words):
+        """uint32 MinHash signature of a word list"""
+        hashes = self.shingle_hashes(words)
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % MINHASH_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def fingerprint(self, normalized_text):
+        words = normalized_words(normalized_text)
+        text_hash = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+        return TextFingerprint(text_hash, words, self)
+
+    @staticmethod
+    def similarity(signature, other):
+        """Estimated Jaccard similarity of the two shingle sets"""
+        return float(np.mean(signature == other))
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures: the signature is split into bands
+    of rows values and keys sharing any whole band are candidate near
+    duplicates, then checked on the full signature. A pair with Jaccard
+    similarity s becomes a candidate with probability 1 - (1 - s**rows) **
+    bands. The defaults (21 bands of 6 rows; the last 2 of 128 values are
+    unused) put the steep part of that curve below the 0.8 threshold:
+    about 0.998 at 0.8, 0.93 at 0.7, 0.28 at 0.5 and 0.015 at 0.3.
+    """
+
+    def __init__(self, num_perm=128, bands=21):
+        if not 0 < bands <= num_perm:
+            raise ValueError("bands must be between 1 and num_perm")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def band_keys(self, signature):
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def candidates(self, signature):
+        """Keys sharing at least one band with signature"""
+        found = set()
+        for bucket, band_key in zip(self.buckets, self.band_keys(signature)):
+            found.update(bucket.get(band_key, ()))
+        return found
+
+    def signature_of(self, key):
+        return self.signatures[key]
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self.buckets, self.band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+    def remove(self, key):
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band_key in zip(self.buckets, self.band_keys(signature)):
+            keys = bucket.get(band_key)
+            if keys is not None and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def query(self, signature, threshold):
+        """(key, similarity) of the most similar indexed signature, or None"""
+        best = None
+        for key in self.candidates(signature):
+            similarity = MinHasher.similarity(signature, self.signature_of(key))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+
+class SQLiteMap:
+    """Minimal dict over a two-column SQLite table (str/int keys -> int)"""
+
+    def __init__(self, db, table):
+        self._db = db
+        self._table = table
+        db.execute(f"CREATE TABLE IF NOT EXISTS {table} (key PRIMARY KEY, value)")
+
+    def get(self, key, default=None):
+        row = self._db.execute(
+            f"SELECT value FROM {self._table} WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row is not None else default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {self._table} (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    def setdefault(self, key, value):
+        self._db.execute(
+            f"INSERT OR IGNORE INTO {self._table} (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+        return self.get(key)
+
+
+class SQLiteLSHIndex(LSHIndex):
+    """LSHIndex keeping its buckets and signatures in SQLite"""
+
+    def __init__(self, db, num_perm=128, bands=21):
+        super().__init__(num_perm, bands)
+        self.buckets = None
+        self.signatures = None
+        self._db = db
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS lsh_buckets (band INTEGER, bucket BLOB, key)"
+        )
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS lsh_buckets_band ON lsh_buckets (band, bucket)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS lsh_signatures (key PRIMARY KEY, signature BLOB)"
+        )
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM lsh_signatures").fetchone()[0]
+
+    def candidates(self, signature):
+        found = set()
+        for band, band_key in enumerate(self.band_keys(signature)):
+            found.update(
+                row[0]
+                for row in self._db.execute(
+                    "SELECT key FROM lsh_buckets WHERE band = ? AND bucket = ?",
+                    (band, band_key),
+                )
+            )
+        return found
+
+    def signature_of(self, key):
+        row = self._db.execute(
+            "SELECT signature FROM lsh_signatures WHERE key = ?", (key,)
+        ).fetchone()
+        return np.frombuffer(row[0], dtype=np.uint32)
+
+    def add(self, key, signature):
+        self._db.execute(
+            "INSERT OR REPLACE INTO lsh_signatures (key, signature) VALUES (?, ?)",
+            (key, signature.tobytes()),
+        )
+        self._db.executemany(
+            "INSERT INTO lsh_buckets (band, bucket, key) VALUES (?, ?, ?)",
+            [
+                (band, band_key, key)
+                for band, band_key in enumerate(self.band_keys(signature))
+            ],
+        )
+
+    def remove(self, key):
+        self._db.execute("DELETE FROM lsh_signatures WHERE key = ?", (key,))
+        self._db.execute("DELETE FROM lsh_buckets WHERE key = ?", (key,))
+
+
+class DuplicateDetector:
+    """
+    Tracks resumes seen so far (in a batch) and reports whether a new one
+    duplicates any of them. Keys are whatever identifies a resume to the
+    caller, e.g. its index in the batch.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=21):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.lsh = LSHIndex(num_perm, bands)
+        self.by_content = {}
+        self.by_text = {}
+
+    def find_content(self, file_hash):
+        """Key of an earlier resume with identical file bytes, or None"""
+        return self.by_content.get(file_hash)
+
+    def add_content(self, key, file_hash):
+        self.by_content.setdefault(file_hash, key)
+
+    def find_text(self, fingerprint):
+        """
+        (key, kind, similarity) of an earlier resume with the same text
+        ("text") or near-identical text ("near"), or None.
+        """
+        key = self.by_text.get(fingerprint.text_hash)
+        if key is not None:
+            return key, "text", 1.0
+        match = self.lsh.query(fingerprint.signature, self.threshold)
+        if match is not None:
+            return match[0], "near", round(match[1], 3)
+        return None
+
+    def add_text(self, key, fingerprint):
+        self.by_text.setdefault(fingerprint.text_hash, key)
+        self.lsh.add(key, fingerprint.signature)
+
+    def close(self):
+        pass
+
+
+class SQLiteDuplicateDetector(DuplicateDetector):
+    """
+    DuplicateDetector whose hashes, LSH buckets and signatures live in a
+    scratch SQLite file, so memory stays flat however many resumes it has
+    seen. Keys must be strings or integers. result_offsets is a spare map
+    for callers to note where each resume's result is stored. The file is
+    deleted on close.
+    """
+
+    def __init__(self, path, threshold=0.8, num_perm=128, bands=21):
+        super().__init__(threshold, num_perm, bands)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # Scratch data: no journal and no fsync
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self.by_content = SQLiteMap(self._db, "content_keys")
+        self.by_text = SQLiteMap(self._db, "text_keys")
+        self.result_offsets = SQLiteMap(self._db, "result_offsets")
+        self.lsh = SQLiteLSHIndex(self._db, num_perm, bands)
+
+    def close(self):
+        self._db.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -8,6 +8,45 @@ import magic
 logger = logging.getLogger(__name__)
 
 
+class SpooledUpload:
+    """
+    An uploaded file held in memory, rolling over to a temporary file on
+    disk only once it grows past the spool threshold. Behaves like a
+    binary file object and keeps the (secured) original filename.
+    """
+
+    def __init__(self, filename, max_memory_size):
+        self.filename = filename
+        if max_memory_size > 0:
+            self.stream = tempfile.SpooledTemporaryFile(max_size=max_memory_size)
+        else:
+            self.stream = tempfile.TemporaryFile()  # Straight to disk
+
+    @property
+    def size(self):
+        position = self.stream.tell()
+        self.stream.seek(0, os.SEEK_END)
+        size = self.stream.tell()
+        self.stream.seek(position)
+        return size
+
+    @property
+    def in_memory(self):
+        return not getattr(self.stream, "_rolled", True)
+
+    def read(self, size=-1):
+        return self.stream.read(size)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.stream.seek(offset, whence)
+
+    def tell(self):
+        return self.stream.tell()
+
+    def close(self):
+        self.stream.close()
+
+
 class FileHandler:
     """Handles file operations for the application"""
 
@@ -38,6 +77,27 @@ class FileHandler:
             logger.error(f"Error validating file content: {e}")
             return False
 
+    def spool_upload(self, file, max_memory_size=None):
+        """
+        Copy an uploaded FileStorage into a SpooledUpload so it outlives the
+        request without touching the disk unless it is larger than
+        max_memory_size (default UPLOAD_SPOOL_THRESHOLD; 0 spools to disk).
+        """
+        try:
+            if max_memory_size is None:
+                max_memory_size = self.config.UPLOAD_SPOOL_THRESHOLD
+            upload = SpooledUpload(secure_filename(file.filename), max_memory_size)
+            shutil.copyfileobj(file.stream, upload.stream)
+            upload.seek(0)
+            logger.debug(
+                f"Spooled upload {upload.filename}: {upload.size} bytes "
+                f"({'memory' if upload.in_memory else 'disk'})"
+            )
+            return upload
+        except Exception as e:
+            logger.error(f"Error spooling upload {file.filename}: {e}")
+            raise
+
     def secure_temp_file(self, file):
         """Create a secure temporary file with a unique name"""
         try:
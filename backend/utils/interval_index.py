@@ -0,0 +1,53 @@
+from bisect import bisect_left
+
+
+class IntervalIndex:
+    """
+    Sorted index of character spans for fast window queries.
+
+    Spans are (start, end, value) tuples. Queries use binary search on the
+    start offsets, so looking up the spans around an entity costs
+    O(log n + matches) instead of rescanning the text.
+    """
+
+    def __init__(self, spans=()):
+        self._spans = sorted(spans, key=lambda span: (span[0], span[1]))
+        self._starts = [span[0] for span in self._spans]
+        self._max_length = max(
+            (end - start for start, end, _ in self._spans), default=0
+        )
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def within(self, start, end):
+        """Spans lying entirely inside [start, end), in offset order"""
+        found = []
+        for index in range(bisect_left(self._starts, start), len(self._spans)):
+            span = self._spans[index]
+            if span[0] >= end:
+                break
+            if span[1] <= end:
+                found.append(span)
+        return found
+
+    def starting_in(self, start, end):
+        """Spans whose start offset lies in [start, end), in offset order"""
+        first = bisect_left(self._starts, start)
+        last = bisect_left(self._starts, end, first)
+        return self._spans[first:last]
+
+    def overlapping(self, start, end):
+        """Spans sharing at least one character with [start, end)"""
+        found = []
+        first = bisect_left(self._starts, start - self._max_length)
+        for index in range(first, len(self._spans)):
+            span = self._spans[index]
+            if span[0] >= end:
+                break
+            if span[1] > start:
+                found.append(span)
+        return found
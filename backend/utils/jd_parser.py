@@ -1,19 +1,33 @@
 import re
-import spacy
+import hashlib
 import logging
+from utils.cache import LRUCache
 from utils.skill_extractor import extract_skills
+from utils.nlp_registry import get_nlp, nlp_registry
+from utils.skills_taxonomy import get_taxonomy
+from utils.vector_service import get_vector_service
 
 logger = logging.getLogger(__name__)
 
 
 class JobDescriptionParser:
-    def __init__(self, skills_db_path="data/technical_skills.json"):
+    def __init__(
+        self,
+        skills_db_path="data/technical_skills.json",
+        model_name=None,
+        cache_size=128,
+        cache_ttl=3600,
+    ):
         try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_md")
+            # Shared spaCy pipeline from the process-wide registry
+            self.nlp = get_nlp(model_name)
+            self.vector_service = get_vector_service(model_name)
+            self.model_name = model_name or nlp_registry.default_model
             # Initialize skill extractor
             self.skill_extractor = extract_skills
             self.skills_db_path = skills_db_path
+            # Processed JD profiles keyed by a hash of the preprocessed text
+            self.profile_cache = LRUCache(cache_size, cache_ttl)
             logger.info("JobDescriptionParser initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing JobDescriptionParser: {e}")
@@ -36,7 +50,7 @@ class JobDescriptionParser:
     def extract_skills(self, jd_text):
         """Extract skills from job description text"""
         try:
-            return self.skill_extractor(jd_text)
+            return self.skill_extractor(jd_text, self.skills_db_path)
         except Exception as e:
             logger.error(f"Error extracting skills: {e}")
             return []
@@ -61,12 +75,32 @@ class JobDescriptionParser:
             logger.error(f"Error extracting requirements: {e}")
             return jd_text
 
+    def profile_key(self, processed_text):
+        """Cache key for a preprocessed JD under the current taxonomy and model"""
+        taxonomy_version = get_taxonomy(self.skills_db_path).snapshot().version
+        digest = hashlib.sha256(processed_text.encode("utf-8")).hexdigest()
+        return f"{digest}:{taxonomy_version}:{self.model_name}"
+
+    def compute_vector(self, processed_text):
+        """Document vector used for semantic similarity (read-only)"""
+        try:
+            return self.vector_service.vector(processed_text)
+        except Exception as e:
+            logger.error(f"Error computing job description vector: {e}")
+            return None
+
     def process_job_description(self, jd_text):
         """Process job description and extract information"""
         try:
             # Preprocess text
             processed_text = self.preprocess_text(jd_text)
 
+            # Repeat postings are served straight from the profile cache
+            cache_key = self.profile_key(processed_text)
+            cached = self.profile_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, skills=list(cached["skills"]))
+
             # Extract requirements section
             requirements = self.extract_requirements(processed_text)
 
@@ -76,12 +110,15 @@ class JobDescriptionParser:
             # Extract experience level indicators
             experience_level = self.extract_experience_level(processed_text)
 
-            return {
+            profile = {
                 "text": processed_text,
                 "requirements": requirements,
                 "skills": skills,
                 "experience_level": experience_level,
+                "vector": self.compute_vector(processed_text),
             }
+            self.profile_cache.set(cache_key, profile)
+            return dict(profile, skills=list(skills))
         except Exception as e:
             logger.error(f"Error processing job description: {e}")
             return {
@@ -1,18 +1,48 @@
-import spacy
-import numpy as np
 import logging
+import numpy as np
 import re
+from bisect import bisect_left, bisect_right
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from config import Config
+from utils.nlp_registry import get_nlp
+from utils.skill_vectors import SkillVectorizer, popcount
+from utils.skills_taxonomy import get_taxonomy
+from utils.vector_service import VectorService, get_vector_service
 
 logger = logging.getLogger(__name__)
 
+# Texts are truncated before TF-IDF to bound vectorizer memory
+MAX_TFIDF_TEXT_LENGTH = 50000
+
+# Overall score weights: skill match, text similarity, semantic similarity
+SKILL_WEIGHT = Config.SKILL_MATCH_WEIGHT
+TEXT_WEIGHT = Config.TEXT_SIMILARITY_WEIGHT
+SEMANTIC_WEIGHT = Config.SEMANTIC_SIMILARITY_WEIGHT
+
 
 class ResumeMatcher:
-    def __init__(self):
+    # Characters either side of a skill mention searched for "N years"
+    SKILL_EXPERIENCE_WINDOW = 100
+
+    def __init__(
+        self,
+        model_name=None,
+        tfidf_model=None,
+        strength_mode="frequency",
+        skills_db_path=None,
+    ):
         try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_md")
+            # Shared vectors-only pipeline; similarity only needs word vectors
+            self.nlp = get_nlp(model_name, variant="vectors")
+            # Batched, cached document vectors
+            self.vector_service = get_vector_service(model_name)
+            # Pre-fitted TfidfModel; None falls back to fitting per request
+            self.tfidf_model = tfidf_model
+            # "frequency" or "proximity" (also credits years mentioned nearby)
+            self.strength_mode = strength_mode
+            # Skills file the parsers extract from; skill bitsets use its IDs
+            self.skills_db_path = skills_db_path
             logger.info("ResumeMatcher initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing ResumeMatcher: {e}")
@@ -47,19 +77,66 @@ class ResumeMatcher:
             logger.error(f"Error calculating skill match: {e}")
             return 0.0, []
 
+    def calculate_skill_matches(self, resume_skill_lists, jd_skills):
+        """
+        Skill match for many resumes against one job description.
+
+        Skills are encoded as bitsets over taxonomy skill IDs, so overlap
+        counts and matching/missing masks for the whole batch come from a
+        few vectorised bitwise operations. Returns one
+        (match_percentage, matching_skills, missing_skills) tuple per resume,
+        identical to calculate_skill_match and get_missing_skills.
+        """
+        try:
+            if not jd_skills:
+                return [(0.0, [], []) for _ in resume_skill_lists]
+            if not resume_skill_lists:
+                return []
+
+            vectorizer = SkillVectorizer(get_taxonomy(self.skills_db_path).snapshot())
+            jd_ids = vectorizer.ids(jd_skills)
+            resume_bits = vectorizer.encode(resume_skill_lists)
+            jd_bits = vectorizer.encode([jd_skills])
+            resume_bits = np.pad(
+                resume_bits, ((0, 0), (0, jd_bits.shape[1] - resume_bits.shape[1]))
+            )
+
+            overlap = popcount(resume_bits & jd_bits)
+            has_skill = SkillVectorizer.contains(resume_bits, jd_ids)
+
+            results = []
+            for count, mask in zip(overlap, has_skill):
+                results.append(
+                    (
+                        float(count) / len(jd_skills) * 100,
+                        [skill for skill, found in zip(jd_skills, mask) if found],
+                        [skill for skill, found in zip(jd_skills, mask) if not found],
+                    )
+                )
+            return results
+        except Exception as e:
+            logger.error(f"Error calculating batch skill match: {e}")
+            return [
+                (
+                    *self.calculate_skill_match(resume_skills, jd_skills),
+                    self.get_missing_skills(resume_skills, jd_skills),
+                )
+                for resume_skills in resume_skill_lists
+            ]
+
     def calculate_text_similarity(self, resume_text, jd_text):
         """Calculate text similarity using TF-IDF and cosine similarity"""
         try:
             # Limit text size to prevent memory issues
-            max_text_length = 50000
-            resume_text = (
-                resume_text[:max_text_length]
-                if len(resume_text) > max_text_length
-                else resume_text
-            )
-            jd_text = (
-                jd_text[:max_text_length] if len(jd_text) > max_text_length else jd_text
-            )
+            resume_text = resume_text[:MAX_TFIDF_TEXT_LENGTH]
+            jd_text = jd_text[:MAX_TFIDF_TEXT_LENGTH]
+
+            # Stable weights from the pre-fitted model
+            if self.tfidf_model is not None:
+                tfidf_matrix = self.tfidf_model.transform([resume_text, jd_text])
+                return (
+                    float((tfidf_matrix[0] @ tfidf_matrix[1].T).toarray()[0, 0]) * 100
+                )
 
             # Create a new vectorizer for each comparison
             vectorizer = TfidfVectorizer()
@@ -75,10 +152,38 @@ class ResumeMatcher:
             logger.error(f"Error calculating text similarity: {e}")
             return 0.0
 
+    def calculate_text_similarities(self, resume_texts, jd_text):
+        """
+        TF-IDF similarity of many resumes to one job description.
+
+        Uses the pre-fitted model when available; otherwise the vectorizer
+        is fitted once on the whole batch (resumes plus JD). Either way all
+        cosines come from a single sparse matrix-vector product. Returns
+        percentages in the order of resume_texts.
+        """
+        try:
+            if not resume_texts:
+                return []
+
+            texts = [text[:MAX_TFIDF_TEXT_LENGTH] for text in resume_texts]
+            texts.append(jd_text[:MAX_TFIDF_TEXT_LENGTH])
+
+            # Rows are L2-normalised, so the dot product is the cosine
+            if self.tfidf_model is not None:
+                tfidf_matrix = self.tfidf_model.transform(texts)
+            else:
+                tfidf_matrix = TfidfVectorizer().fit_transform(texts)
+            similarities = tfidf_matrix[:-1] @ tfidf_matrix[-1].T
+
+            return [float(value) * 100 for value in similarities.toarray().ravel()]
+        except Exception as e:
+            logger.error(f"Error calculating batch text similarity: {e}")
+            return [0.0] * len(resume_texts)
+
     def get_missing_skills(self, resume_skills, jd_skills):
         """Get skills present in JD but missing in resume"""
         try:
-            resume_skills_lower = [s.lower() for s in resume_skills]
+            resume_skills_lower = {s.lower() for s in resume_skills}
 
             missing_skills = []
             for skill in jd_skills:
@@ -90,78 +195,151 @@ class ResumeMatcher:
             logger.error(f"Error calculating missing skills: {e}")
             return []
 
-    def calculate_semantic_similarity(self, resume_text, jd_text):
-        """Calculate semantic similarity using spaCy"""
+    def calculate_semantic_similarity(self, resume_text, jd_text, jd_vector=None):
+        """Calculate semantic similarity using spaCy document vectors"""
         try:
-            # Limit text size to prevent memory issues
-            max_text_length = 10000
-            resume_text = (
-                resume_text[:max_text_length]
-                if len(resume_text) > max_text_length
-                else resume_text
-            )
-            jd_text = (
-                jd_text[:max_text_length] if len(jd_text) > max_text_length else jd_text
+            return float(
+                self.vector_service.similarities([resume_text], jd_text, jd_vector)[0]
             )
-
-            # Process texts in chunks if needed
-            if len(resume_text) > 5000 or len(jd_text) > 5000:
-                # For long texts, use a simpler approach to avoid memory issues
-                resume_doc = self.nlp.pipe([resume_text], disable=["parser", "ner"])
-                jd_doc = self.nlp.pipe([jd_text], disable=["parser", "ner"])
-
-                resume_vector = next(resume_doc).vector
-                jd_vector = next(jd_doc).vector
-
-                # Calculate cosine similarity manually
-                similarity = np.dot(resume_vector, jd_vector) / (
-                    np.linalg.norm(resume_vector) * np.linalg.norm(jd_vector)
-                )
-            else:
-                # For shorter texts, use the full spaCy pipeline
-                resume_doc = self.nlp(resume_text)
-                jd_doc = self.nlp(jd_text)
-                similarity = resume_doc.similarity(jd_doc)
-
-            return similarity * 100  # Convert to percentage
         except Exception as e:
             logger.error(f"Error calculating semantic similarity: {e}")
             return 0.0
 
-    def get_matching_score(self, resume_data, jd_data):
-        """Calculate overall matching score between resume and job description"""
+    def calculate_semantic_similarities(self, resume_texts, jd_text, jd_vector=None):
+        """
+        Semantic similarity of many resumes to one job description. Resume
+        vectors are computed in one nlp.pipe pass and the JD vector once.
+        """
         try:
-            # Calculate skill match
-            skill_match, matching_skills = self.calculate_skill_match(
-                resume_data["skills"], jd_data["skills"]
+            similarities = self.vector_service.similarities(
+                resume_texts, jd_text, jd_vector
             )
+            return [float(value) for value in similarities]
+        except Exception as e:
+            logger.error(f"Error calculating batch semantic similarity: {e}")
+            return [0.0] * len(resume_texts)
+
+    def calculate_skill_match_matrix(self, resume_skill_lists, jd_skill_lists):
+        """
+        (resumes, jobs) matrix of skill match percentages, from one bitset
+        overlap count across every resume/JD pair.
+        """
+        vectorizer = SkillVectorizer(get_taxonomy(self.skills_db_path).snapshot())
+        resume_bits = vectorizer.encode(resume_skill_lists)
+        jd_bits = vectorizer.encode(jd_skill_lists)
+        overlap = SkillVectorizer.overlap_matrix(resume_bits, jd_bits)
+        jd_sizes = np.array([len(skills) for skills in jd_skill_lists], np.float64)
+        return np.divide(
+            overlap * 100.0,
+            jd_sizes,
+            out=np.zeros(overlap.shape),
+            where=jd_sizes > 0,
+        )
+
+    def calculate_text_similarity_matrix(self, resume_texts, jd_texts):
+        """(resumes, jobs) TF-IDF cosine percentages from one sparse product"""
+        texts = [text[:MAX_TFIDF_TEXT_LENGTH] for text in resume_texts]
+        texts.extend(text[:MAX_TFIDF_TEXT_LENGTH] for text in jd_texts)
+        if self.tfidf_model is not None:
+            tfidf_matrix = self.tfidf_model.transform(texts)
+        else:
+            tfidf_matrix = TfidfVectorizer().fit_transform(texts)
+        resume_rows = tfidf_matrix[: len(resume_texts)]
+        jd_rows = tfidf_matrix[len(resume_texts) :]
+        return (resume_rows @ jd_rows.T).toarray() * 100
+
+    def calculate_semantic_similarity_matrix(
+        self, resume_texts, jd_texts, jd_vectors=None
+    ):
+        """
+        (resumes, jobs) document-vector cosine percentages. JD vectors from
+        the JD profiles are used where given.
+        """
+        resume_matrix = self.vector_service.vectors(resume_texts)
+        if jd_vectors is not None and all(v is not None for v in jd_vectors):
+            jd_matrix = np.vstack(jd_vectors)
+        else:
+            jd_matrix = self.vector_service.vectors(jd_texts)
+        return VectorService.cosine_matrix(resume_matrix, jd_matrix) * 100
+
+    @staticmethod
+    def score_upper_bound(skill_match, text_similarity=None):
+        """
+        Highest overall score reachable given the stages computed so far:
+        each similarity still to come can add at most its weight x 100.
+        Works elementwise on arrays.
+        """
+        bound = SKILL_WEIGHT * skill_match + SEMANTIC_WEIGHT * 100
+        if text_similarity is None:
+            return bound + TEXT_WEIGHT * 100
+        return bound + TEXT_WEIGHT * text_similarity
+
+    @staticmethod
+    def provisional_score(skill_match, text_similarity=None):
+        """
+        Overall score estimated from the cheap stages only (skill match,
+        plus TF-IDF if computed), rescaled to 0-100 over their weights
+        """
+        if text_similarity is None:
+            return skill_match
+        return (SKILL_WEIGHT * skill_match + TEXT_WEIGHT * text_similarity) / (
+            SKILL_WEIGHT + TEXT_WEIGHT
+        )
+
+    def get_matching_score(
+        self,
+        resume_data,
+        jd_data,
+        text_similarity=None,
+        semantic_similarity=None,
+        skill_result=None,
+    ):
+        """
+        Calculate overall matching score between resume and job description.
+        Precomputed text/semantic similarities and skill results (e.g. from
+        the batch calculate_* methods) skip the per-pair computation.
+        """
+        try:
+            # Calculate skill match
+            if skill_result is None:
+                skill_match, matching_skills = self.calculate_skill_match(
+                    resume_data["skills"], jd_data["skills"]
+                )
+                missing_skills = self.get_missing_skills(
+                    resume_data["skills"], jd_data["skills"]
+                )
+            else:
+                skill_match, matching_skills, missing_skills = skill_result
 
             # Calculate text similarity
-            text_similarity = self.calculate_text_similarity(
-                resume_data["text"], jd_data["text"]
-            )
-
-            # Get missing skills
-            missing_skills = self.get_missing_skills(
-                resume_data["skills"], jd_data["skills"]
-            )
+            if text_similarity is None:
+                text_similarity = self.calculate_text_similarity(
+                    resume_data["text"], jd_data["text"]
+                )
 
             # Calculate semantic similarity
-            semantic_similarity = self.calculate_semantic_similarity(
-                resume_data["text"], jd_data["text"]
-            )
+            if semantic_similarity is None:
+                semantic_similarity = self.calculate_semantic_similarity(
+                    resume_data["text"], jd_data["text"], jd_data.get("vector")
+                )
 
-            # Calculate skill strengths
+            # Calculate skill strengths from the parse's occurrence counts
             skill_strengths = self.calculate_skill_strength(
-                resume_data["text"], matching_skills
+                resume_data["text"], matching_skills, resume_data.get("skill_counts")
             )
+            if self.strength_mode == "proximity":
+                skill_strengths = self.calculate_proximity_strength(
+                    skill_strengths,
+                    resume_data.get("skill_positions"),
+                    resume_data.get("experience_mentions"),
+                )
 
             # Calculate overall score (weighted)
             # 60% skill match, 20% text similarity, 20% semantic similarity
             overall_score = (
-                (0.6 * skill_match)
-                + (0.2 * text_similarity)
-                + (0.2 * semantic_similarity)
+                (SKILL_WEIGHT * skill_match)
+                + (TEXT_WEIGHT * text_similarity)
+                + (SEMANTIC_WEIGHT * semantic_similarity)
             )
 
             # Prepare result
@@ -192,14 +370,26 @@ class ResumeMatcher:
                 "skill_strengths": {},
             }
 
-    def calculate_skill_strength(self, resume_text, skills):
-        """Calculate the strength of each skill based on frequency and context"""
+    @staticmethod
+    def _by_lower(mapping):
+        return {key.lower(): value for key, value in (mapping or {}).items()}
+
+    def calculate_skill_strength(self, resume_text, skills, skill_counts=None):
+        """
+        Calculate the strength of each skill based on frequency. Occurrence
+        counts from the resume parse are used when given; only resumes
+        parsed without them fall back to scanning resume_text.
+        """
         skill_strengths = {}
+        counts = self._by_lower(skill_counts) if skill_counts is not None else None
 
         for skill in skills:
             # Count occurrences
-            pattern = r"\b" + re.escape(skill) + r"\b"
-            occurrences = len(re.findall(pattern, resume_text, re.IGNORECASE))
+            if counts is not None:
+                occurrences = counts.get(skill.lower(), 0)
+            else:
+                pattern = r"\b" + re.escape(skill) + r"\b"
+                occurrences = len(re.findall(pattern, resume_text, re.IGNORECASE))
 
             # Basic strength calculation
             if occurrences == 0:
@@ -214,3 +404,47 @@ class ResumeMatcher:
             skill_strengths[skill] = strength
 
         return skill_strengths
+
+    def calculate_skill_years(self, skills, skill_positions, experience_mentions):
+        """
+        Years of experience stated near each skill: the largest "N years"
+        mention within SKILL_EXPERIENCE_WINDOW characters of any mention.
+        """
+        if not skill_positions or not experience_mentions:
+            return {}
+
+        mentions = sorted(experience_mentions)
+        offsets = [offset for offset, _ in mentions]
+        positions = self._by_lower(skill_positions)
+        window = self.SKILL_EXPERIENCE_WINDOW
+
+        skill_years = {}
+        for skill in skills:
+            best = 0.0
+            for position in positions.get(skill.lower(), ()):
+                first = bisect_left(offsets, position - window)
+                last = bisect_right(offsets, position + window)
+                for _, years in mentions[first:last]:
+                    best = max(best, years)
+            if best:
+                skill_years[skill] = best
+        return skill_years
+
+    def calculate_proximity_strength(
+        self, skill_strengths, skill_positions, experience_mentions
+    ):
+        """
+        Raise frequency-based strengths using years of experience mentioned
+        next to the skill (1 year -> 70, 4+ years -> 100).
+        """
+        skill_years = self.calculate_skill_years(
+            skill_strengths, skill_positions, experience_mentions
+        )
+        return {
+            skill: (
+                max(strength, min(100, 60 + int(10 * skill_years[skill])))
+                if skill in skill_years
+                else strength
+            )
+            for skill, strength in skill_strengths.items()
+        }
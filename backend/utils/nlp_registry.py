@@ -0,0 +1,158 @@
+import logging
+import os
+import subprocess
+import sys
+import time
+from threading import Lock
+
+import numpy as np
+import spacy
+from config import Config
+from utils.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+# Components kept active for each pipeline variant (None keeps everything).
+# Disabled components are skipped per call, so every variant shares one model.
+PIPELINE_VARIANTS = {
+    "full": None,
+    "vectors": (),  # Tokenizer and static word vectors only
+    "pos": ("tok2vec", "tagger", "attribute_ruler"),
+    "ner": ("tok2vec", "ner"),
+}
+
+
+def _current_rss_mb():
+    """Resident set size of this process in MB (0 when unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, AttributeError, IndexError, ValueError):
+        return 0.0
+
+
+class NLPHandle:
+    """Shared, read-only view of a loaded pipeline with some components disabled"""
+
+    def __init__(self, nlp, variant, disable):
+        self._nlp = nlp
+        self.variant = variant
+        self.disable = list(disable)
+
+    @property
+    def vocab(self):
+        return self._nlp.vocab
+
+    @property
+    def tokenizer(self):
+        return self._nlp.tokenizer
+
+    @property
+    def pipe_names(self):
+        return [name for name in self._nlp.pipe_names if name not in self.disable]
+
+    def make_doc(self, text):
+        return self._nlp.make_doc(text)
+
+    def __call__(self, text):
+        return self._nlp(text, disable=self.disable)
+
+    def pipe(self, texts, disable=None, **kwargs):
+        """Run nlp.pipe with this variant's components (plus any extra) disabled"""
+        disabled = self.disable + [
+            name for name in (disable or []) if name not in self.disable
+        ]
+        return self._nlp.pipe(texts, disable=disabled, **kwargs)
+
+
+class NLPModelRegistry:
+    """Loads each spaCy pipeline once per process and hands out shared handles"""
+
+    def __init__(self, default_model=None):
+        self.default_model = default_model or Config.NLP_MODEL
+        self._models = {}
+        self._handles = {}
+        self._stats = {}
+        self._lock = Lock()
+
+    def _load_model(self, model_name):
+        """Load a spaCy model, downloading it on first use if necessary"""
+        try:
+            return self._load_with_vector_store(model_name)
+        except OSError:
+            logger.warning(f"spaCy model {model_name} not found, downloading...")
+            subprocess.run([sys.executable, "-m", "spacy", "download", model_name])
+            return self._load_with_vector_store(model_name)
+
+    def _load_with_vector_store(self, model_name):
+        """
+        Load a model, backing its vectors with the shared memory-mapped store
+        when a float32 one was exported instead of a private copy
+        """
+        store = get_vector_store(model_name)
+        if store is None or store.vectors.dtype != np.float32:
+            return spacy.load(model_name)
+        nlp = spacy.load(model_name, exclude=["vectors"])
+        return store.attach(nlp)
+
+    def load(self, model_name=None):
+        """Return the shared pipeline for model_name, loading it on first use"""
+        model_name = model_name or self.default_model
+        nlp = self._models.get(model_name)
+        if nlp is not None:
+            return nlp
+
+        with self._lock:
+            nlp = self._models.get(model_name)
+            if nlp is None:
+                rss_before = _current_rss_mb()
+                start = time.perf_counter()
+                nlp = self._load_model(model_name)
+                load_seconds = time.perf_counter() - start
+                memory_mb = max(0.0, _current_rss_mb() - rss_before)
+
+                self._stats[model_name] = {
+                    "load_seconds": round(load_seconds, 3),
+                    "memory_mb": round(memory_mb, 1),
+                    "pipeline": list(nlp.pipe_names),
+                }
+                self._models[model_name] = nlp
+                logger.info(
+                    f"Loaded spaCy model {model_name} in {load_seconds:.2f}s "
+                    f"(+{memory_mb:.1f} MB RSS), pipeline: {nlp.pipe_names}"
+                )
+        return nlp
+
+    def get(self, model_name=None, variant="full"):
+        """Return a shared NLPHandle for a model and pipeline variant"""
+        if variant not in PIPELINE_VARIANTS:
+            raise ValueError(f"Unknown pipeline variant: {variant}")
+
+        model_name = model_name or self.default_model
+        key = (model_name, variant)
+        handle = self._handles.get(key)
+        if handle is None:
+            nlp = self.load(model_name)
+            keep = PIPELINE_VARIANTS[variant]
+            disable = (
+                []
+                if keep is None
+                else [name for name in nlp.pipe_names if name not in keep]
+            )
+            handle = NLPHandle(nlp, variant, disable)
+            self._handles[key] = handle
+        return handle
+
+    def stats(self):
+        """Load time and memory recorded for each loaded model"""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+# Process-wide registry shared by parsers, matcher and skill extraction
+nlp_registry = NLPModelRegistry()
+
+
+def get_nlp(model_name=None, variant="full"):
+    """Shortcut for nlp_registry.get"""
+    return nlp_registry.get(model_name, variant)
@@ -0,0 +1,102 @@
+"""
+Resume parsing in a pool of worker processes.
+
+Text extraction, regex scanning and most of spaCy hold the GIL, so parsing
+threads barely overlap. Each worker process builds its own ResumeParser
+(and loads the spaCy model) once, in the pool initializer, and then parses
+the resumes it is sent: paths are passed as-is, uploads as raw bytes.
+With the "fork" start method every worker is forked when the pool starts,
+so workers share the models the parent has already loaded (copy-on-write).
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from utils.resume_cache import read_source_bytes
+from utils.resume_parser import ResumeParser
+from utils.text_extractor import source_name
+
+logger = logging.getLogger(__name__)
+
+# The parser owned by the current worker process (set by _init_worker)
+_worker_parser = None
+
+
+def _init_worker(skills_db_path, model_name):
+    global _worker_parser
+    _worker_parser = ResumeParser(skills_db_path, model_name)
+
+
+def _parse_in_worker(source, filename):
+    return _worker_parser.process_resume(source, filename)
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+class ParsePool:
+    """
+    Process pool that stands in for a ResumeParser: process_resume and
+    cache_version have the same signatures, so ResumeCache.get_or_parse
+    and BatchMatchingService work unchanged. Calls block until a worker
+    returns, so callers fan out from threads (one per worker).
+    """
+
+    def __init__(
+        self, resume_parser, skills_db_path, workers=None, start_method="fork"
+    ):
+        self.resume_parser = resume_parser
+        self.skills_db_path = skills_db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method
+        self._executor = None
+        self._lock = Lock()
+
+    def executor(self):
+        """The process pool, started on first use"""
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method)
+                if self.start_method == "forkserver":
+                    # Preload the parser modules rather than __main__, which
+                    # would re-run the app's startup in the fork server
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.skills_db_path, self.resume_parser.model_name),
+                )
+                logger.info(
+                    f"Started resume parse pool: {self.workers} "
+                    f"{self.start_method} workers"
+                )
+            return self._executor
+
+    def warm(self):
+        """Start every worker now so no request waits for model loading"""
+        executor = self.executor()
+        futures = [executor.submit(_worker_ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+        logger.info(f"Resume parse pool warm: {self.workers} workers ready")
+
+    def cache_version(self):
+        return self.resume_parser.cache_version()
+
+    def process_resume(self, source, filename=None):
+        """Parse a resume (path, bytes or stream) in a worker process"""
+        if not isinstance(source, (str, os.PathLike)):
+            filename = source_name(source, filename)
+            source = read_source_bytes(source)
+        return self.executor().submit(_parse_in_worker, source, filename).result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,44 @@
+import heapq
+from threading import Lock
+
+import numpy as np
+
+
+def top_indices(scores, k):
+    """Indices of the k highest scores, best first"""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
+
+
+class LiveRanking:
+    """
+    Thread-safe ranking of results that arrive one at a time, so the best
+    candidates so far can be shown while a batch is still being scored.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self._results = []
+        self._lock = Lock()
+
+    @property
+    def scored(self):
+        return len(self._results)
+
+    def add(self, result):
+        """Record a result; returns how many have been scored"""
+        with self._lock:
+            self._results.append(result)
+            return len(self._results)
+
+    def top(self, k):
+        """The k best results so far (copies with rank set), best first"""
+        with self._lock:
+            best = heapq.nlargest(
+                k, self._results, key=lambda result: result.get("overall_score", 0)
+            )
+        return [dict(result, rank=rank) for rank, result in enumerate(best, start=1)]
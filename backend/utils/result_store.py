@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """
+    Append-only JSON Lines file of per-candidate results.
+
+    Large batches write every result here as soon as it is scored and keep
+    only byte offsets in memory; individual records are read back by
+    offset and the whole file can be streamed to clients.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a+b")
+
+    def append(self, record):
+        """Write a record; returns its byte offset"""
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(line)
+            self.count += 1
+            return offset
+
+    def read(self, offset):
+        """The record written at offset"""
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            return json.loads(self._file.readline())
+
+    def __iter__(self):
+        """All records in write order (re-opens the file, so safe to stream)"""
+        with self._lock:
+            self._file.flush()
+        with open(self.path, "rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def delete(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
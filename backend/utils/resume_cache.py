@@ -0,0 +1,172 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+def read_source_bytes(source):
+    """Read the raw bytes of a resume given as a path, bytes or binary stream"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        content = source.read()
+        source.seek(0)
+        return content
+    with open(str(source), "rb") as f:
+        return f.read()
+
+
+class ResumeCache:
+    """
+    Content-addressed cache of parsed resumes.
+
+    Entries are keyed by the SHA-256 of the file bytes plus the parser's
+    cache version (parser code, taxonomy and NLP model), so re-uploads of
+    the same file skip text extraction and NLP entirely. An in-memory LRU
+    tier sits in front of an optional SQLite tier that survives restarts.
+    """
+
+    def __init__(self, db_path=None, memory_size=256, max_disk_entries=10000):
+        self.memory = LRUCache(memory_size)
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._writes = 0
+        self._lock = Lock()
+        self._db = None
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS parsed_resumes ("
+                    "key TEXT PRIMARY KEY, data TEXT NOT NULL, created_at REAL)"
+                )
+                self._db.commit()
+                logger.info(f"Resume cache persisted to {db_path}")
+            except Exception as e:
+                logger.error(f"Error opening resume cache {db_path}: {e}")
+                self._db = None
+
+    @staticmethod
+    def make_key(content, version):
+        """Cache key for raw file bytes parsed by a given parser version"""
+        return f"{hashlib.sha256(content).hexdigest()}:{version}"
+
+    def get(self, key):
+        """Return a copy of the cached parsed resume, or None"""
+        data = self.memory.get(key)
+        if data is None and self._db is not None:
+            data = self._disk_get(key)
+            if data is not None:
+                self.memory.set(key, data)
+        return copy.deepcopy(data) if data is not None else None
+
+    def set(self, key, data):
+        """Store a parsed resume in both tiers"""
+        self.memory.set(key, copy.deepcopy(data))
+        if self._db is not None:
+            self._disk_set(key, data)
+
+    def get_or_parse(self, source, parser, filename=None):
+        """
+        Return the parsed resume for source, parsing it only on a miss.
+        Stage timings belong to one parse, so they are not cached; a hit is
+        marked "cached": True with the timings of the lookup itself.
+        """
+        start = time.perf_counter()
+        try:
+            key = self.make_key(read_source_bytes(source), parser.cache_version())
+        except Exception as e:
+            logger.error(f"Error hashing resume for cache lookup: {e}")
+            return parser.process_resume(source, filename)
+
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Resume cache hit: {key[:12]}")
+            lookup_ms = round((time.perf_counter() - start) * 1000, 2)
+            cached["timings"] = {"cache_lookup": lookup_ms, "total": lookup_ms}
+            cached["cached"] = True
+            return cached
+
+        resume_data = parser.process_resume(source, filename)
+        # Failed parses are not cached so a fixed parser can retry them
+        if resume_data.get("text"):
+            self.set(
+                key,
+                {
+                    name: value
+                    for name, value in resume_data.items()
+                    if name != "timings"
+                },
+            )
+        return resume_data
+
+    def _disk_get(self, key):
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT data FROM parsed_resumes WHERE key = ?", (key,)
+                ).fetchone()
+            except Exception as e:
+                logger.error(f"Error reading resume cache: {e}")
+                row = None
+        if row is None:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        return json.loads(row[0])
+
+    def _disk_set(self, key, data):
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parsed_resumes (key, data, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(data), time.time()),
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._prune()
+                self._db.commit()
+            except Exception as e:
+                logger.error(f"Error writing resume cache: {e}")
+
+    def _prune(self):
+        """Drop the oldest disk entries beyond max_disk_entries"""
+        self._db.execute(
+            "DELETE FROM parsed_resumes WHERE key IN ("
+            "SELECT key FROM parsed_resumes ORDER BY created_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def stats(self):
+        """Hit/miss counters for both tiers"""
+        disk_entries = 0
+        if self._db is not None:
+            with self._lock:
+                disk_entries = self._db.execute(
+                    "SELECT COUNT(*) FROM parsed_resumes"
+                ).fetchone()[0]
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": self._db is not None,
+                "entries": disk_entries,
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+            },
+        }
@@ -1,114 +1,105 @@
-import os
 import re
-import PyPDF2
-from docx import Document
-import spacy
 import logging
-import tempfile
-from utils.skill_extractor import extract_skills
+import time
+from utils import text_extractor
+from utils.skill_extractor import extract_skills, find_skill_hits
+from utils.nlp_registry import get_nlp, nlp_registry
+from utils.skills_taxonomy import get_taxonomy
+from utils.interval_index import IntervalIndex
+from utils.section_segmenter import SectionSegmenter
 
 logger = logging.getLogger(__name__)
 
+# Noise stripped by preprocess_text before skills are counted
+EMAIL_NOISE_PATTERN = re.compile(r"\S+@\S+")
+URL_NOISE_PATTERN = re.compile(r"http\S+|www\S+")
+PHONE_NOISE_PATTERN = re.compile(
+    r"\+?[0-9]?[\s-]?\(?[0-9]{3}\)?[\s-]?[0-9]{3}[\s-]?[0-9]{4}"
+)
+
+# Enhanced job title pattern with common variations
+JOB_TITLE_PATTERN = re.compile(
+    r"(?i)((?:senior|junior|lead|principal|staff)?\s*(?:software|systems?|data|cloud|devops|full[\s-]stack|front[\s-]end|back[\s-]end)?\s*(?:developer|engineer|architect|manager|analyst|scientist|consultant|specialist|admin|lead)(?:\s*[IV]{1,3})?)"
+)
+
+# Date pattern for work experience
+WORK_DATE_PATTERN = re.compile(
+    r"(?:(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)[,\s]+\d{4}\s*(?:-|–|to)\s*(?:present|current|(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)[,\s]+\d{4}))",
+    re.IGNORECASE,
+)
+
+# Comprehensive degree pattern
+DEGREE_PATTERN = re.compile(
+    r"(?i)(?:bachelor(?:'s|s)?|master(?:'s|s)?|phd|doctorate|b\.?(?:tech|e|s|a)|m\.?(?:tech|e|s|a)|ph\.?d)\.?\s+(?:of|in|degree\s+in)?\s*(?:science|engineering|technology|computer|information|business|[a-z\s]+)?"
+)
+
+# Year range pattern for education
+EDUCATION_DATE_PATTERN = re.compile(r"20\d{2}\s*(?:-|–|to)\s*(?:20\d{2}|present)")
+
+# GPA pattern
+GPA_PATTERN = re.compile(r"(?i)(?:cgpa|gpa)[:\s]*([0-9]+(?:\.[0-9]+)?)")
+
+# Years-of-experience mentions, e.g. "5+ years", "3 yrs", "2.5 years"
+YEARS_PATTERN = re.compile(r"(?i)\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b")
+
 
 class ResumeParser:
+    # Bump whenever extraction logic changes so cached parses are invalidated
+    PARSER_VERSION = "2"
 
-    def __init__(self, skills_db_path="backend / data / technical_skills.json"):
+    # Longest text handed to spaCy in a single pass
+    MAX_NLP_TEXT_LENGTH = 100000
+
+    def __init__(self, skills_db_path="data/technical_skills.json", model_name=None):
         try:
-            # Load spaCy model
-            self.nlp = spacy.load("en_core_web_md")
+            # Shared full pipeline; one annotated doc feeds every extractor
+            self.nlp = get_nlp(model_name)
+            self.model_name = model_name or nlp_registry.default_model
             # Initialize skill extractor
             self.skill_extractor = extract_skills
             self.skills_db_path = skills_db_path
+            self.section_segmenter = SectionSegmenter()
             logger.info("ResumeParser initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing ResumeParser: {e}")
             raise
 
-    def extract_text_from_pdf(self, pdf_path):
+    def extract_text_from_pdf(self, pdf_source):
         """Extract text from PDF file"""
-        try:
-            text = ""
-            with open(pdf_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num in range(len(pdf_reader.pages)):
-                    text += pdf_reader.pages[page_num].extract_text()
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            return ""
+        return text_extractor.extract_text_from_pdf(pdf_source)
 
-    def extract_text_from_docx(self, docx_path):
+    def extract_text_from_docx(self, docx_source):
         """Extract text from DOCX file"""
+        return text_extractor.extract_text_from_docx(docx_source)
+
+    def extract_text(self, file_obj, filename=None):
+        """
+        Extract text from various file formats. Accepts a file path, raw
+        bytes/memoryview or a binary stream (upload, BytesIO, spooled file)
+        and reads in-memory sources without writing them to disk.
+        """
         try:
-            doc = Document(docx_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from DOCX: {e}")
-            return ""
-
-    def extract_text(self, file_obj):
-        """Extract text from various file formats"""
-        try:
-            # Handle both filepath strings and FileStorage objects
-            if hasattr(file_obj, "filename"):
-                # Create temp file from FileStorage
-                temp_fd, temp_path = tempfile.mkstemp(
-                    suffix=os.path.splitext(file_obj.filename)[1]
-                )
-                try:
-                    with os.fdopen(temp_fd, "wb") as temp_file:
-                        file_obj.save(temp_file)
-
-                    # Log the temp file path for debugging
-                    logger.info(f"Created temporary file at: {temp_path}")
-
-                    # Extract text based on file type
-                    if file_obj.filename.lower().endswith(".pdf"):
-                        text = self.extract_text_from_pdf(temp_path)
-                    elif file_obj.filename.lower().endswith(".docx"):
-                        text = self.extract_text_from_docx(temp_path)
-                    elif file_obj.filename.lower().endswith(".txt"):
-                        with open(
-                            temp_path, "r", encoding="utf-8", errors="replace"
-                        ) as f:
-                            text = f.read()
-                    else:
-                        raise ValueError("Unsupported file format")
-
-                    return text
-                finally:
-                    # Always cleanup temp file
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                        logger.info(f"Removed temporary file: {temp_path}")
-            else:
-                # Handle direct file paths
-                file_path = str(file_obj)
-                logger.info(f"Processing file path: {file_path}")
-
-                # Check if file exists
-                if not os.path.exists(file_path):
-                    logger.error(f"File does not exist: {file_path}")
-                    raise FileNotFoundError(f"File not found: {file_path}")
-
-                if file_path.lower().endswith(".pdf"):
-                    return self.extract_text_from_pdf(file_path)
-                elif file_path.lower().endswith(".docx"):
-                    return self.extract_text_from_docx(file_path)
-                elif file_path.lower().endswith(".txt"):
-                    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                        return f.read()
-                else:
-                    raise ValueError(f"Unsupported file format: {file_path}")
+            logger.info(
+                f"Extracting text from: {text_extractor.source_name(file_obj, filename)}"
+            )
+            return text_extractor.extract_text(file_obj, filename)
         except Exception as e:
             logger.error(f"Error extracting text: {e}")
             raise ValueError(f"Could not extract text from file: {str(e)}")
 
-    def get_skills(self, resume_text):
+    def cache_version(self):
+        """Identifies everything that shapes a parse: code, taxonomy and model"""
+        taxonomy_version = get_taxonomy(self.skills_db_path).snapshot().version
+        return f"{self.PARSER_VERSION}:{taxonomy_version}:{self.model_name}"
+
+    def annotate(self, text):
+        """Run the spaCy pipeline once over the resume text"""
+        return self.nlp(text[: self.MAX_NLP_TEXT_LENGTH])
+
+    def get_skills(self, resume_text, doc=None, hits=None):
         """Extract skills from resume text"""
         try:
-            return self.skill_extractor(resume_text)
+            return self.skill_extractor(resume_text, self.skills_db_path, doc, hits)
         except Exception as e:
             logger.error(f"Error extracting skills: {e}")
             return []
@@ -117,13 +108,11 @@ class ResumeParser:
         """Clean and preprocess the text"""
         try:
             # Remove email addresses
-            text = re.sub(r"\S+@\S+", "", text)
+            text = EMAIL_NOISE_PATTERN.sub("", text)
             # Remove URLs
-            text = re.sub(r"http\S+|www\S+", "", text)
+            text = URL_NOISE_PATTERN.sub("", text)
             # Remove phone numbers
-            text = re.sub(
-                r"\+?[0-9]?[\s-]?\(?[0-9]{3}\)?[\s-]?[0-9]{3}[\s-]?[0-9]{4}", "", text
-            )
+            text = PHONE_NOISE_PATTERN.sub("", text)
             # Convert to lowercase
             text = text.lower()
             # Remove extra whitespace
@@ -133,12 +122,117 @@ class ResumeParser:
             logger.error(f"Error preprocessing text: {e}")
             return text
 
-    def extract_contact_info(self, text):
+    def segment_sections(self, text):
+        """Detect Experience/Education/Projects/Skills/Summary sections"""
+        return self.section_segmenter.segment(text)
+
+    def _section_window(self, sections, name, ent, radius, text_length):
+        """
+        Context window around an entity, clipped to its section. Returns None
+        when the resume has that section but the entity lies outside it.
+        """
+        bounds = (0, text_length)
+        if sections and sections.has(name):
+            bounds = sections.span_at(name, ent.start_char)
+            if bounds is None:
+                return None
+        return (
+            max(bounds[0], ent.start_char - radius),
+            min(bounds[1], ent.end_char + radius),
+        )
+
+    def _section_regions(self, sections, name, text):
+        """Spans of a section, or the whole text if the resume lacks it"""
+        if sections and sections.has(name):
+            return sections.spans(name)
+        return [(0, len(text))]
+
+    def _match_index(self, pattern, text, regions, group=0):
+        """Scan regions once with a compiled pattern and index the matches"""
+        return IntervalIndex(
+            (match.start(), match.end(), match.group(group))
+            for start, end in regions
+            for match in pattern.finditer(text, start, end)
+        )
+
+    def _first_match_in_window(self, index, pattern, text, window, group=0):
+        """
+        First match in the window, as a scan over the window slice finds
+        it. Indexed matches starting inside the window answer directly; a
+        match that runs past the window edge is re-matched with the window
+        as its limit. When an indexed match straddles the window start, or
+        none starts inside it, the slice is scanned, since it can match the
+        tail of a straddling span (e.g. "Software Engineer" out of "Senior
+        Software Engineer").
+        """
+        start, end = window
+        straddling = any(
+            match_start < start
+            for match_start, _, _ in index.overlapping(start, start + 1)
+        )
+        if not straddling:
+            for match_start, match_end, value in index.starting_in(start, end):
+                if match_end <= end:
+                    return value
+                match = pattern.match(text, match_start, end)
+                if match:
+                    return match.group(group)
+        match = pattern.search(text[start:end])
+        return match.group(group) if match else ""
+
+    def find_skill_hits(self, text):
+        """
+        Scan the original text for skills once, keeping character offsets.
+        Hits inside emails, URLs and phone numbers are dropped, mirroring
+        what preprocess_text strips before skills are counted.
+        """
+        try:
+            noise = IntervalIndex(
+                (match.start(), match.end(), None)
+                for pattern in (
+                    EMAIL_NOISE_PATTERN,
+                    URL_NOISE_PATTERN,
+                    PHONE_NOISE_PATTERN,
+                )
+                for match in pattern.finditer(text)
+            )
+            return [
+                hit
+                for hit in find_skill_hits(text, self.skills_db_path)
+                if not noise.overlapping(hit.start, hit.end)
+            ]
+        except Exception as e:
+            logger.error(f"Error finding skill hits: {e}")
+            return []
+
+    def skill_occurrences(self, skill_hits):
+        """
+        Per-skill occurrence counts and start offsets (in the original text)
+        from the skill scan, so scoring never re-scans the text
+        """
+        counts = {}
+        positions = {}
+        for hit in skill_hits:
+            counts[hit.skill] = counts.get(hit.skill, 0) + 1
+            positions.setdefault(hit.skill, []).append(hit.start)
+        return counts, positions
+
+    def find_experience_mentions(self, text):
+        """[offset, years] for every years-of-experience mention in text"""
+        try:
+            return [
+                [match.start(), float(match.group(1))]
+                for match in YEARS_PATTERN.finditer(text)
+            ]
+        except Exception as e:
+            logger.error(f"Error finding experience mentions: {e}")
+            return []
+
+    def extract_contact_info(self, text, doc=None):
         """Extract contact information from resume text"""
         try:
-            doc = self.nlp(
-                text[:100000] if len(text) > 100000 else text
-            )  # Limit text size
+            if doc is None:
+                doc = self.annotate(text)
 
             # Initialize contact info dictionary
             contact_info = {"name": "", "email": "", "phone": "", "location": ""}
@@ -202,18 +296,19 @@ class ResumeParser:
         )
         return company.strip()
 
-    def extract_work_experience(self, text):
+    def extract_work_experience(self, text, doc=None, sections=None):
         """Extract work experience from resume text"""
         try:
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.annotate(text)
             experience_entries = []
             seen_companies = set()
 
-            # Enhanced job title pattern with common variations
-            job_title_pattern = r"(?i)((?:senior|junior|lead|principal|staff)?\s*(?:software|systems?|data|cloud|devops|full[\s-]stack|front[\s-]end|back[\s-]end)?\s*(?:developer|engineer|architect|manager|analyst|scientist|consultant|specialist|admin|lead)(?:\s*[IV]{1,3})?)"
-
-            # Date pattern for work experience
-            date_pattern = r"(?:(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)[,\s]+\d{4}\s*(?:-|–|to)\s*(?:present|current|(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)[,\s]+\d{4}))"
+            # Titles and dates are found in one pass each over the section,
+            # then joined to entity offsets through interval indexes
+            regions = self._section_regions(sections, "experience", text)
+            title_index = self._match_index(JOB_TITLE_PATTERN, text, regions, 1)
+            date_index = self._match_index(WORK_DATE_PATTERN, text, regions)
 
             # Find company mentions
             for ent in doc.ents:
@@ -231,21 +326,26 @@ class ResumeParser:
                     ):
                         continue
 
-                    context_window = text[
-                        max(0, ent.start_char - 150) : min(
-                            len(text), ent.end_char + 150
-                        )
-                    ]
+                    window = self._section_window(
+                        sections, "experience", ent, 150, len(text)
+                    )
+                    if window is None:
+                        continue
+                    context_window = text[window[0] : window[1]]
 
-                    titles = re.findall(job_title_pattern, context_window)
-                    dates = re.findall(date_pattern, context_window, re.IGNORECASE)
+                    title = self._first_match_in_window(
+                        title_index, JOB_TITLE_PATTERN, text, window, 1
+                    )
+                    date_range = self._first_match_in_window(
+                        date_index, WORK_DATE_PATTERN, text, window
+                    )
 
-                    if titles and dates:
+                    if title and date_range:
                         experience_entries.append(
                             {
                                 "company": company,
-                                "title": self.normalize_job_title(titles[0]),
-                                "date_range": dates[0],
+                                "title": self.normalize_job_title(title),
+                                "date_range": date_range,
                                 "description": self._extract_description(
                                     context_window
                                 ),
@@ -280,21 +380,23 @@ class ResumeParser:
         except Exception:
             return ""
 
-    def extract_education(self, text):
+    def extract_education(self, text, doc=None, sections=None):
         """Extract education information from resume text"""
         try:
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.annotate(text)
             education_entries = []
             seen_institutions = set()
 
             # Education keywords to validate institutions
             edu_keywords = ["university", "college", "institute", "school"]
 
-            # Comprehensive degree pattern
-            degree_pattern = r"(?i)(?:bachelor(?:'s|s)?|master(?:'s|s)?|phd|doctorate|b\.?(?:tech|e|s|a)|m\.?(?:tech|e|s|a)|ph\.?d)\.?\s+(?:of|in|degree\s+in)?\s*(?:science|engineering|technology|computer|information|business|[a-z\s]+)?"
-
-            # GPA pattern
-            gpa_pattern = r"(?i)(?:cgpa|gpa)[:\s]*([0-9]+(?:\.[0-9]+)?)"
+            # Degrees, dates and GPAs are found in one pass each over the
+            # section, then joined to entity offsets through interval indexes
+            regions = self._section_regions(sections, "education", text)
+            degree_index = self._match_index(DEGREE_PATTERN, text, regions)
+            date_index = self._match_index(EDUCATION_DATE_PATTERN, text, regions)
+            gpa_index = self._match_index(GPA_PATTERN, text, regions, 1)
 
             for ent in doc.ents:
                 if ent.label_ == "ORG":
@@ -309,25 +411,26 @@ class ResumeParser:
                     if institution in seen_institutions:
                         continue
 
-                    context_window = text[
-                        max(0, ent.start_char - 200) : min(
-                            len(text), ent.end_char + 200
-                        )
-                    ]
+                    window = self._section_window(
+                        sections, "education", ent, 200, len(text)
+                    )
+                    if window is None:
+                        continue
 
                     # Extract degree
-                    degree_matches = re.findall(degree_pattern, context_window)
-                    degree = degree_matches[0] if degree_matches else ""
+                    degree = self._first_match_in_window(
+                        degree_index, DEGREE_PATTERN, text, window
+                    )
 
                     # Extract dates
-                    date_matches = re.findall(
-                        r"20\d{2}\s*(?:-|–|to)\s*(?:20\d{2}|present)", context_window
+                    date = self._first_match_in_window(
+                        date_index, EDUCATION_DATE_PATTERN, text, window
                     )
-                    date = date_matches[0] if date_matches else ""
 
                     # Extract GPA
-                    gpa_matches = re.search(gpa_pattern, context_window)
-                    gpa = gpa_matches.group(1) if gpa_matches else ""
+                    gpa = self._first_match_in_window(
+                        gpa_index, GPA_PATTERN, text, window, 1
+                    )
 
                     if degree:  # Only add if we found a valid degree
                         education_entries.append(
@@ -354,28 +457,33 @@ class ResumeParser:
         except Exception:
             return ""
 
-    def extract_projects(self, text):
+    def extract_projects(self, text, skill_hits=None, sections=None):
         """Extract project information from resume text"""
         try:
+            # Technologies come from the resume-wide skill hits
+            if skill_hits is None:
+                skill_hits = self.find_skill_hits(text)
+            skill_index = IntervalIndex(
+                (hit.start, hit.end, hit.skill) for hit in skill_hits
+            )
+
             # Enhanced project pattern
             project_patterns = [
                 r"(?i)(?:project|projects?)[\s:]+([A-Za-z0-9\s\-]+)(?:\n|$)",
                 r"(?i)(?:developed|created|implemented|built)[\s:]+([A-Za-z0-9\s\-]+)(?:\n|$)",
             ]
 
+            # Only scan the Projects section when the resume has one
+            regions = self._section_regions(sections, "projects", text)
+
             project_entries = []
             for pattern in project_patterns:
-                projects = re.finditer(pattern, text)
-                for match in projects:
-                    project_name = match.group(1).strip()
-                    if len(project_name) > 3:  # Filter out too short matches
-                        context = text[match.start() : match.start() + 200]
-                        project_entries.append(
-                            {
-                                "name": project_name,
-                                "description": self._extract_description(context),
-                                "technologies": self._extract_technologies(context),
-                            }
+                for region_start, region_end in regions:
+                    for match in re.compile(pattern).finditer(
+                        text, region_start, region_end
+                    ):
+                        self._add_project(
+                            project_entries, text, match, skill_index, region_end
                         )
 
             return project_entries
@@ -383,22 +491,54 @@ class ResumeParser:
             logger.error(f"Error extracting projects: {e}")
             return []
 
-    def _extract_technologies(self, text):
-        """Extract technologies mentioned in the context"""
+    def _add_project(self, project_entries, text, match, skill_index, region_end):
+        """Build a project entry from a pattern match within its region"""
+        project_name = match.group(1).strip()
+        if len(project_name) > 3:  # Filter out too short matches
+            context_end = min(region_end, match.start() + 200)
+            context = text[match.start() : context_end]
+            project_entries.append(
+                {
+                    "name": project_name,
+                    "description": self._extract_description(context),
+                    "technologies": self._extract_technologies(
+                        skill_index, match.start(), context_end
+                    ),
+                }
+            )
+
+    def _extract_technologies(self, skill_index, start, end):
+        """Extract technologies mentioned between two offsets of the resume"""
         try:
-            # Extract skills from the context
-            skills = self.get_skills(text)
-            return list(set(skills))[:5]  # Return up to 5 unique technologies
+            # Skill hits inside the context, in order of first mention
+            technologies = []
+            for _, _, skill in skill_index.within(start, end):
+                if skill not in technologies:
+                    technologies.append(skill)
+            return technologies[:5]  # Return up to 5 unique technologies
         except Exception:
             return []
 
-    def process_resume(self, file_path):
-        """Process resume file and extract information"""
+    def process_resume(self, file_path, filename=None):
+        """Process resume file (path, bytes or stream) and extract information"""
         try:
+            timings = {}
+            stage_start = time.perf_counter()
+
+            def mark(stage):
+                nonlocal stage_start
+                now = time.perf_counter()
+                timings[stage] = round((now - stage_start) * 1000, 2)
+                stage_start = now
+
             # Extract text
-            text = self.extract_text(file_path)
+            text = self.extract_text(file_path, filename)
+            mark("extract_text")
             if not text:
-                logger.warning(f"No text extracted from file: {file_path}")
+                logger.warning(
+                    f"No text extracted from file: "
+                    f"{text_extractor.source_name(file_path, filename)}"
+                )
                 return {
                     "text": "",
                     "skills": [],
@@ -410,17 +550,38 @@ class ResumeParser:
 
             # Preprocess text
             processed_text = self.preprocess_text(text)
+            mark("preprocess")
+
+            # Single NLP pass over the original text, shared by all extractors
+            doc = self.annotate(text)
+            mark("nlp")
+
+            # Section map so each extractor only scans its own region
+            sections = self.segment_sections(text)
+            mark("sections")
+
+            # Single skill scan with offsets, reused for project technologies
+            skill_hits = self.find_skill_hits(text)
 
             # Extract information
-            skills = self.get_skills(processed_text)
+            skills = self.get_skills(processed_text, doc, skill_hits)
+            skill_counts, skill_positions = self.skill_occurrences(skill_hits)
+            experience_mentions = self.find_experience_mentions(text)
+            mark("skills")
             contact_info = self.extract_contact_info(
-                text
+                text, doc
             )  # Use original text for contact info
-            experience = self.extract_work_experience(text)
-            education = self.extract_education(text)
-            projects = self.extract_projects(text)
+            mark("contact_info")
+            experience = self.extract_work_experience(text, doc, sections)
+            mark("experience")
+            education = self.extract_education(text, doc, sections)
+            mark("education")
+            projects = self.extract_projects(text, skill_hits, sections)
+            mark("projects")
+            timings["total"] = round(sum(timings.values()), 2)
 
             logger.info(f"Resume processed successfully: {len(skills)} skills found")
+            logger.info(f"Resume stage timings (ms): {timings}")
             # logger.info(f"""
             #     skills: {skills},
             #     contact_info: {contact_info},
@@ -433,12 +594,17 @@ class ResumeParser:
             return {
                 "text": processed_text,
                 "skills": skills,
+                "skill_counts": skill_counts,
+                "skill_positions": skill_positions,
+                "experience_mentions": experience_mentions,
                 "contact_info": contact_info,
                 "experience": experience,
                 "education": education,
                 "projects": projects,
                 "requirements": "",  # Add empty fields for consistency
                 "experience_level": "",
+                "sections": sections.to_dict(),
+                "timings": timings,
             }
         except Exception as e:
             logger.error(f"Error processing resume: {e}")
@@ -0,0 +1,134 @@
+import logging
+import re
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+Section = namedtuple("Section", ["name", "header_start", "start", "end"])
+
+# Header spellings recognised for each resume section
+SECTION_HEADERS = {
+    "summary": (
+        "summary",
+        "professional summary",
+        "career summary",
+        "profile",
+        "professional profile",
+        "objective",
+        "career objective",
+        "about me",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "relevant experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ),
+    "education": (
+        "education",
+        "education and training",
+        "academic background",
+        "academic qualifications",
+        "academics",
+    ),
+    "projects": (
+        "projects",
+        "personal projects",
+        "academic projects",
+        "key projects",
+        "project experience",
+        "selected projects",
+    ),
+    "skills": (
+        "skills",
+        "technical skills",
+        "key skills",
+        "core competencies",
+        "technologies",
+        "tools and technologies",
+        "skills and tools",
+    ),
+}
+
+_HEADER_TO_SECTION = {
+    header: section
+    for section, headers in SECTION_HEADERS.items()
+    for header in headers
+}
+
+# A header sits alone on its line, optionally decorated and/or followed by a
+# colon; after a colon the section content may continue on the same line
+HEADER_PATTERN = re.compile(
+    r"^[^\S\n]*[#*•\-=]*[^\S\n]*(?P<header>"
+    + "|".join(
+        re.escape(header).replace(r"\ ", r"[^\S\n]+")
+        for header in sorted(_HEADER_TO_SECTION, key=len, reverse=True)
+    )
+    + r")[^\S\n]*(?::|[^\S\n]*$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class SectionMap:
+    """Character spans of the sections detected in a resume"""
+
+    def __init__(self, sections=()):
+        self.sections = list(sections)
+
+    def __bool__(self):
+        return bool(self.sections)
+
+    def has(self, name):
+        return any(section.name == name for section in self.sections)
+
+    def spans(self, name):
+        """(start, end) content spans for a section name"""
+        return [
+            (section.start, section.end)
+            for section in self.sections
+            if section.name == name
+        ]
+
+    def span_at(self, name, offset):
+        """The span of section name containing offset, or None"""
+        for start, end in self.spans(name):
+            if start <= offset < end:
+                return start, end
+        return None
+
+    def to_dict(self):
+        """JSON-friendly {section: [[start, end], ...]} map"""
+        section_map = {}
+        for section in self.sections:
+            section_map.setdefault(section.name, []).append(
+                [section.start, section.end]
+            )
+        return section_map
+
+
+class SectionSegmenter:
+    """Splits resume text into sections by detecting header lines"""
+
+    def segment(self, text):
+        """Return a SectionMap for text (empty if no headers were found)"""
+        try:
+            headers = []
+            for match in HEADER_PATTERN.finditer(text):
+                header = " ".join(match.group("header").lower().split())
+                headers.append((_HEADER_TO_SECTION[header], match.start(), match.end()))
+
+            sections = []
+            for index, (name, header_start, content_start) in enumerate(headers):
+                content_end = (
+                    headers[index + 1][1] if index + 1 < len(headers) else len(text)
+                )
+                sections.append(Section(name, header_start, content_start, content_end))
+
+            return SectionMap(sections)
+        except Exception as e:
+            logger.error(f"Error segmenting resume sections: {e}")
+            return SectionMap()
@@ -1,73 +1,56 @@
-import re
-import json
-import spacy
 from collections import Counter
+from utils.nlp_registry import get_nlp
+from utils.skills_taxonomy import get_taxonomy
 
 
-def load_skills_database(filepath="data/technical_skills.json"):
-    """Load skills database from JSON file"""
-    try:
-        with open(filepath, "r") as f:
-            skills_data = json.load(f)
-
-        # Combine all skills from different categories into a single list
-        all_skills = []
-        for category, skills in skills_data.items():
-            all_skills.extend(skills)
-
-        # Remove duplicates
-        seen = set()
-        unique_skills = [
-            skill
-            for skill in all_skills
-            if not (skill.lower() in seen or seen.add(skill.lower()))
-        ]
+def load_skills_database(filepath=None):
+    """Return the skills database, loaded once and shared across calls"""
+    snapshot = get_taxonomy(filepath).snapshot()
+    return {"all_skills": snapshot.skills, "categories": snapshot.categories}
+
 
-        return {"all_skills": unique_skills}
+def find_skill_hits(text, skills_db_path=None):
+    """Return every taxonomy skill occurrence in text with its offsets"""
+    try:
+        return get_taxonomy(skills_db_path).snapshot().matcher.find_all(text)
     except Exception as e:
-        print(f"Error loading skills database: {e}")
-        return {"all_skills": []}
+        print(f"Error finding skill hits: {e}")
+        return []
 
 
-def extract_skills(text):
+def extract_skills(text, skills_db_path=None, doc=None, hits=None):
     """
-    Extract technical skills from text using pattern matching and NLP
+    Extract technical skills from text using pattern matching and NLP.
+    Pass an already annotated spaCy doc to skip the tagging pass, and
+    precomputed skill hits (see find_skill_hits) to skip the text scan.
     """
     try:
-        # Load skills database
-        skills_data = load_skills_database()
-        all_skills = skills_data["all_skills"]
+        # Compiled taxonomy; swapped for a fresh one when the file changes
+        taxonomy = get_taxonomy(skills_db_path).snapshot()
+        all_skills = taxonomy.skills
 
         if not all_skills:
             return []
 
-        # Convert skills to lowercase for case-insensitive matching
-        skills_lower = {skill.lower(): skill for skill in all_skills}
-
-        # Load spaCy model for entity recognition and NLP processing
-        try:
-            nlp = spacy.load("en_core_web_md")
-        except OSError:
-            print("Downloading spaCy model...")
-            import subprocess
-
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_md"])
-            nlp = spacy.load("en_core_web_md")
-
-        # Process the text
-        doc = nlp(
-            text[:100000] if len(text) > 100000 else text
-        )  # Limit text size for processing
-
-        # Extract potential skills based on known skill list
-        found_skills = []
-
-        # Direct matching with word boundaries
-        for skill in all_skills:
-            # Create regex pattern with word boundaries
-            pattern = r"\b" + re.escape(skill) + r"\b"
-            if re.search(pattern, text, re.IGNORECASE):
-                found_skills.append(skill)
+        # Lowercase lookup for case-insensitive matching
+        skills_lower = taxonomy.skills_lower
+
+        if doc is None:
+            # Shared tagger-only pipeline; POS tags are all this pass needs
+            nlp = get_nlp(variant="pos")
+            doc = nlp(
+                text[:100000] if len(text) > 100000 else text
+            )  # Limit text size for processing
+
+        # Direct matching with word boundaries, in a single pass over the text,
+        # reported in taxonomy order
+        if hits is None:
+            hits = taxonomy.matcher.iter_matches(text)
+        matched = {hit.skill for hit in hits}
+        found_skills = sorted(
+            matched,
+            key=lambda skill: taxonomy.skill_ids.get(skill.lower(), len(all_skills)),
+        )
 
         # Extract skills using NLP - looking for nouns that might be technical terms
         potential_skills = []
@@ -0,0 +1,162 @@
+import gc
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+SkillHit = namedtuple("SkillHit", ["skill", "start", "end"])
+
+
+def _is_word_char(char):
+    """Mirror the regex definition of a word character (\\w)"""
+    return char.isalnum() or char == "_"
+
+
+def _normalize_skill(skill):
+    """Lowercase a skill and collapse internal whitespace to single spaces"""
+    return " ".join(skill.lower().split())
+
+
+def _lowercase_preserving_offsets(text):
+    """Lowercase text without changing its length so offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. "İ") expand when lowercased; keep those as-is
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton compiled from a skill taxonomy.
+
+    Finds every skill in a single left-to-right scan, so matching cost depends
+    on the length of the text rather than the number of skills. Matching is
+    case-insensitive, a space inside a skill matches any run of whitespace and
+    word boundaries are only enforced on edges that are word characters, which
+    keeps tokens like "c++", "c#" and "node.js" matchable.
+    """
+
+    def __init__(self, skills):
+        self.skills = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        # The trie allocates one dict per state; cyclic GC passes over those
+        # dominate build time for large taxonomies and find nothing to free
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            seen = set()
+            for skill in skills:
+                key = _normalize_skill(skill)
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                self._add_pattern(key, len(self.skills))
+                self.skills.append(skill)
+
+            self._build_failure_links()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        logger.debug(
+            f"SkillMatcher compiled {len(self.skills)} skills into "
+            f"{len(self._goto)} states"
+        )
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add_pattern(self, pattern, skill_index):
+        """Insert a normalized skill into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (
+            (
+                skill_index,
+                len(pattern),
+                _is_word_char(pattern[0]),
+                _is_word_char(pattern[-1]),
+            ),
+        )
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                if target == next_state:
+                    target = 0
+                self._fail[next_state] = target
+                if self._out[target]:
+                    self._out[next_state] += self._out[target]
+
+    def iter_matches(self, text):
+        """Yield a SkillHit for every skill occurrence, including overlaps"""
+        if not text:
+            return
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        skills = self.skills
+        text_length = len(text)
+
+        state = 0
+        consumed = []  # Original offset of every character fed to the automaton
+        previous_space = False
+
+        for position, char in enumerate(_lowercase_preserving_offsets(text)):
+            if char.isspace():
+                if previous_space:
+                    continue
+                previous_space = True
+                char = " "
+            else:
+                previous_space = False
+            consumed.append(position)
+
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill_index, length, word_start, word_end in out[state]:
+                start = consumed[-length]
+                if word_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if (
+                    word_end
+                    and position + 1 < text_length
+                    and _is_word_char(text[position + 1])
+                ):
+                    continue
+                yield SkillHit(skills[skill_index], start, position + 1)
+
+    def find_all(self, text):
+        """Return all skill hits sorted by start offset"""
+        return sorted(self.iter_matches(text), key=lambda hit: (hit.start, hit.end))
+
+    def occurrences(self, text):
+        """Map each found skill to its list of (start, end) offsets"""
+        found = {}
+        for hit in self.find_all(text):
+            found.setdefault(hit.skill, []).append((hit.start, hit.end))
+        return found
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Number of set bits in every byte value
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], np.uint8)
+
+
+def popcount(bits):
+    """Set bits per row of a packed bitset matrix (summed over the last axis)"""
+    return POPCOUNT_TABLE[bits].sum(axis=-1, dtype=np.int64)
+
+
+class SkillVectorizer:
+    """
+    Encodes skill lists as packed bitsets over a taxonomy's integer skill IDs.
+
+    Bit i of a row is set when the list contains the skill with ID i, so
+    overlaps between many resumes and job descriptions are bitwise ANDs plus
+    a popcount. Skills missing from the taxonomy (e.g. resumes parsed under
+    an older version) get IDs after the taxonomy's, local to this instance.
+    """
+
+    def __init__(self, taxonomy):
+        self.skill_ids = taxonomy.skill_ids
+        self._extra_ids = {}
+
+    @property
+    def n_skills(self):
+        return len(self.skill_ids) + len(self._extra_ids)
+
+    def skill_id(self, skill):
+        """ID of a skill (case-insensitive), allocating one for unknown skills"""
+        key = skill.lower()
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = self._extra_ids.setdefault(
+                key, len(self.skill_ids) + len(self._extra_ids)
+            )
+        return skill_id
+
+    def ids(self, skills):
+        """int64 array of IDs for a skill list, in list order"""
+        return np.fromiter((self.skill_id(skill) for skill in skills), np.int64)
+
+    def encode(self, skill_lists):
+        """Packed (len(skill_lists), n_bytes) uint8 bitset matrix"""
+        id_lists = [self.ids(skills) for skills in skill_lists]
+        rows = np.zeros((len(id_lists), self.n_skills), dtype=bool)
+        lengths = [len(skill_ids) for skill_ids in id_lists]
+        if sum(lengths):
+            rows[
+                np.repeat(np.arange(len(id_lists)), lengths), np.concatenate(id_lists)
+            ] = True
+        return np.packbits(rows, axis=1)
+
+    @staticmethod
+    def contains(bits, skill_ids):
+        """
+        Boolean (rows, len(skill_ids)) matrix: whether each bitset row has
+        each skill. IDs beyond a row's width count as absent.
+        """
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        in_range = (skill_ids >> 3) < bits.shape[1]
+        byte_index = np.where(in_range, skill_ids >> 3, 0)
+        shift = (7 - (skill_ids & 7)).astype(np.uint8)
+        return ((bits[:, byte_index] >> shift) & 1).astype(bool) & in_range
+
+    @staticmethod
+    def overlap_matrix(row_bits, column_bits):
+        """(rows, columns) matrix of shared-skill counts between two sets"""
+        width = max(row_bits.shape[1], column_bits.shape[1])
+        row_bits = _pad(row_bits, width)
+        column_bits = _pad(column_bits, width)
+        return popcount(row_bits[:, None, :] & column_bits[None, :, :])
+
+
+def _pad(bits, width):
+    """Right-pad a packed bitset matrix with zero bytes to width"""
+    if bits.shape[1] == width:
+        return bits
+    return np.pad(bits, ((0, 0), (0, width - bits.shape[1])))
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+from config import Config
+from utils.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def resolve_data_path(path):
+    """Resolve a relative data path against the cwd, then the backend dir"""
+    if os.path.isabs(path) or os.path.exists(path):
+        return path
+    return os.path.join(BACKEND_DIR, path)
+
+
+class TaxonomySnapshot:
+    """Immutable, fully compiled view of one version of the skills file"""
+
+    def __init__(self, categories, version=""):
+        self.version = version
+        self.categories = {
+            category: tuple(skills) for category, skills in categories.items()
+        }
+
+        # Unique skills across categories, keeping the first spelling seen
+        self.skills_lower = {}
+        self.skill_categories = {}
+        for category, skills in self.categories.items():
+            for skill in skills:
+                key = skill.lower()
+                self.skills_lower.setdefault(key, skill)
+                memberships = self.skill_categories.setdefault(key, [])
+                if category not in memberships:
+                    memberships.append(category)
+        self.skills = list(self.skills_lower.values())
+        # Integer ID of each skill (lowercased), valid for this snapshot only
+        self.skill_ids = {key: i for i, key in enumerate(self.skills_lower)}
+
+        self.matcher = SkillMatcher(self.skills)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def skill_id(self, skill):
+        """Integer ID of a skill, or None if it is not in the taxonomy"""
+        return self.skill_ids.get(skill.lower())
+
+    def categories_for(self, skill):
+        """Categories a skill belongs to (empty if it is not in the taxonomy)"""
+        return list(self.skill_categories.get(skill.lower(), []))
+
+    def skills_in(self, category):
+        """Skills listed under a category"""
+        return list(self.categories.get(category, ()))
+
+
+class SkillsTaxonomy:
+    """
+    Skills database loaded once and kept compiled in memory.
+
+    The file is checked at most every check_interval seconds. When its
+    mtime or size changes and the content hash differs, a new snapshot is
+    built and swapped in with a single assignment, so readers always see a
+    complete taxonomy and never touch the file on the request path.
+    """
+
+    def __init__(self, path, check_interval=None):
+        self.path = resolve_data_path(path)
+        self.check_interval = (
+            Config.SKILLS_DB_RELOAD_INTERVAL
+            if check_interval is None
+            else check_interval
+        )
+        self._snapshot = None
+        self._file_stamp = None
+        self._last_check = 0.0
+        self._lock = Lock()
+
+    def snapshot(self):
+        """Return the current snapshot, reloading it if the file changed"""
+        if self._snapshot is None:
+            self.reload()
+        elif time.monotonic() - self._last_check >= self.check_interval:
+            # Never block readers: whoever gets the lock checks the file while
+            # everyone else keeps serving the current snapshot
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._reload_locked()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    def reload(self, force=False):
+        """Rebuild the snapshot if the skills file changed on disk"""
+        with self._lock:
+            return self._reload_locked(force)
+
+    def _reload_locked(self, force=False):
+        """Check the file and swap in a new snapshot; caller holds the lock"""
+        self._last_check = time.monotonic()
+        try:
+            stat = os.stat(self.path)
+            file_stamp = (stat.st_mtime_ns, stat.st_size)
+            if (
+                not force
+                and self._snapshot is not None
+                and file_stamp == self._file_stamp
+            ):
+                return False
+
+            with open(self.path, "rb") as f:
+                content = f.read()
+            version = hashlib.sha256(content).hexdigest()[:16]
+            self._file_stamp = file_stamp
+            if (
+                not force
+                and self._snapshot is not None
+                and version == self._snapshot.version
+            ):
+                return False
+
+            snapshot = TaxonomySnapshot(json.loads(content), version)
+        except Exception as e:
+            logger.error(f"Error loading skills database {self.path}: {e}")
+            if self._snapshot is None:
+                self._snapshot = TaxonomySnapshot({})
+            return False
+
+        self._snapshot = snapshot
+        logger.info(
+            f"Loaded skills taxonomy {self.path} (version {version}): "
+            f"{len(snapshot)} skills in {len(snapshot.categories)} categories"
+        )
+        return True
+
+
+_taxonomies = {}
+_taxonomies_lock = Lock()
+
+
+def get_taxonomy(path=None):
+    """Return the shared SkillsTaxonomy for a skills file"""
+    path = resolve_data_path(path or Config.SKILLS_DB_PATH)
+    taxonomy = _taxonomies.get(path)
+    if taxonomy is None:
+        with _taxonomies_lock:
+            taxonomy = _taxonomies.setdefault(path, SkillsTaxonomy(path))
+    return taxonomy
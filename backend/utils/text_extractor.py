@@ -0,0 +1,102 @@
+import io
+import logging
+import os
+
+import PyPDF2
+from docx import Document
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+
+def source_name(source, filename=None):
+    """Display name of a resume source (path, upload or raw bytes)"""
+    if filename:
+        return os.path.basename(filename)
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(str(source))
+    return os.path.basename(getattr(source, "filename", None) or "resume")
+
+
+def source_extension(source, filename=None):
+    """Lowercase file extension of a resume source, e.g. ".pdf" """
+    if filename is None:
+        if isinstance(source, (str, os.PathLike)):
+            filename = str(source)
+        else:
+            filename = getattr(source, "filename", None) or ""
+    return os.path.splitext(filename)[1].lower()
+
+
+def open_stream(source):
+    """Return a readable, rewound binary stream for an in-memory source"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def extract_text_from_pdf(pdf_source):
+    """Extract text from a PDF path or binary stream"""
+    try:
+        text = ""
+        if isinstance(pdf_source, (str, os.PathLike)):
+            with open(pdf_source, "rb") as file:
+                return extract_text_from_pdf(file)
+        pdf_reader = PyPDF2.PdfReader(pdf_source)
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+        return text
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF: {e}")
+        return ""
+
+
+def extract_text_from_docx(docx_source):
+    """Extract text from a DOCX path or binary stream"""
+    try:
+        doc = Document(docx_source)
+        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+    except Exception as e:
+        logger.error(f"Error extracting text from DOCX: {e}")
+        return ""
+
+
+def extract_text_from_txt(txt_source):
+    """Decode a plain text path or binary stream"""
+    if isinstance(txt_source, (str, os.PathLike)):
+        with open(txt_source, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    content = txt_source.read()
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    return content
+
+
+_EXTRACTORS = {
+    ".pdf": extract_text_from_pdf,
+    ".docx": extract_text_from_docx,
+    ".txt": extract_text_from_txt,
+}
+
+
+def extract_text(source, filename=None):
+    """
+    Extract text from a resume given as a file path, raw bytes/memoryview
+    or a binary file-like object (BytesIO, upload, spooled file). The
+    format comes from filename, or from the path/upload name.
+    """
+    extension = source_extension(source, filename)
+    extractor = _EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ValueError(f"Unsupported file format: {source_name(source, filename)}")
+
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            logger.error(f"File does not exist: {source}")
+            raise FileNotFoundError(f"File not found: {source}")
+        return extractor(source)
+
+    return extractor(open_stream(source))
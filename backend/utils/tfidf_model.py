@@ -0,0 +1,178 @@
+"""
+Pre-fitted TF-IDF model shared by all scoring requests.
+
+The vocabulary and IDF table are built offline from a corpus of past resumes
+and job descriptions, saved to a directory and loaded once at startup, with
+the IDF array memory-mapped. Rebuild it from the backend directory with:
+
+    python -m utils.tfidf_model build <corpus_dir> [--output data/tfidf]
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from config import Config
+from utils.text_extractor import SUPPORTED_EXTENSIONS, extract_text
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+IDF_FILE = "idf.npy"
+VOCABULARY_FILE = "vocabulary.json"
+
+MODES = ("vocabulary", "hashing")
+
+
+class TfidfModel:
+    """
+    TF-IDF weighting with a fixed vocabulary (or feature hashing) and IDF
+    table, so scores stay comparable across requests.
+
+    In "vocabulary" mode terms map through a stored vocabulary and unseen
+    terms are ignored. In "hashing" mode terms are hashed into n_features
+    buckets, which bounds memory regardless of corpus size.
+    """
+
+    def __init__(self, idf, vocabulary=None, mode="vocabulary", n_features=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown TF-IDF mode: {mode}")
+        self.idf = idf
+        self.vocabulary = vocabulary
+        self.mode = mode
+        self.n_features = len(idf) if n_features is None else n_features
+        self._vectorizer = self._count_vectorizer(mode, vocabulary, self.n_features)
+
+    @staticmethod
+    def _count_vectorizer(mode, vocabulary=None, n_features=None):
+        """Raw term-count vectorizer, tokenising like TfidfVectorizer"""
+        if mode == "hashing":
+            return HashingVectorizer(
+                n_features=n_features, alternate_sign=False, norm=None
+            )
+        return CountVectorizer(vocabulary=vocabulary)
+
+    @classmethod
+    def build(cls, texts, mode="vocabulary", n_features=2**18, min_df=1):
+        """Fit vocabulary and smoothed IDF weights on a corpus of texts"""
+        texts = list(texts)
+        if not texts:
+            raise ValueError("Cannot build a TF-IDF model from an empty corpus")
+
+        if mode == "hashing":
+            counts = cls._count_vectorizer(mode, n_features=n_features).transform(texts)
+            vocabulary = None
+        else:
+            vectorizer = CountVectorizer(min_df=min_df)
+            counts = vectorizer.fit_transform(texts)
+            vocabulary = {
+                term: int(index) for term, index in vectorizer.vocabulary_.items()
+            }
+
+        # Same smoothing as sklearn's TfidfTransformer
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + len(texts)) / (1 + document_frequency)) + 1
+
+        return cls(idf.astype(np.float32), vocabulary, mode, counts.shape[1])
+
+    def transform(self, texts):
+        """L2-normalised sparse TF-IDF rows for texts"""
+        counts = self._vectorizer.transform(texts).astype(np.float32)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def save(self, directory, documents=None):
+        """Write the IDF array, vocabulary and metadata to directory"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, IDF_FILE), np.asarray(self.idf))
+        if self.vocabulary is not None:
+            with open(os.path.join(directory, VOCABULARY_FILE), "w") as f:
+                json.dump(self.vocabulary, f)
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(
+                {
+                    "mode": self.mode,
+                    "n_features": self.n_features,
+                    "documents": documents,
+                    "built_at": time.time(),
+                },
+                f,
+                indent=2,
+            )
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load a saved model; the IDF array is memory-mapped by default"""
+        with open(os.path.join(directory, META_FILE), "r") as f:
+            meta = json.load(f)
+        idf = np.load(
+            os.path.join(directory, IDF_FILE), mmap_mode="r" if mmap else None
+        )
+        vocabulary = None
+        if meta["mode"] != "hashing":
+            with open(os.path.join(directory, VOCABULARY_FILE), "r") as f:
+                vocabulary = json.load(f)
+        return cls(idf, vocabulary, meta["mode"], meta["n_features"])
+
+    @classmethod
+    def load_if_exists(cls, directory):
+        """Load the model in directory, or return None if none was built"""
+        if not directory or not os.path.exists(os.path.join(directory, META_FILE)):
+            logger.info(f"No TF-IDF model at {directory}; fitting TF-IDF per request")
+            return None
+        try:
+            model = cls.load(directory)
+            logger.info(
+                f"Loaded {model.mode} TF-IDF model from {directory} "
+                f"({model.n_features} features)"
+            )
+            return model
+        except Exception as e:
+            logger.error(f"Error loading TF-IDF model from {directory}: {e}")
+            return None
+
+
+def read_corpus(directory):
+    """Extract the text of every supported document under directory"""
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if os.path.splitext(filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            path = os.path.join(root, filename)
+            try:
+                text = extract_text(path)
+            except Exception as e:
+                logger.error(f"Skipping {path}: {e}")
+                continue
+            if text.strip():
+                yield text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the TF-IDF model")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build a model from a corpus")
+    build.add_argument("corpus", help="Directory of past resumes and job descriptions")
+    build.add_argument("--output", default=Config.TFIDF_MODEL_DIR)
+    build.add_argument("--mode", choices=MODES, default="vocabulary")
+    build.add_argument("--n-features", type=int, default=2**18)
+    build.add_argument("--min-df", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    texts = list(read_corpus(args.corpus))
+    model = TfidfModel.build(texts, args.mode, args.n_features, args.min_df)
+    model.save(args.output, documents=len(texts))
+    logger.info(
+        f"Built {model.mode} TF-IDF model from {len(texts)} documents "
+        f"({model.n_features} features) in {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import hashlib
+import logging
+from threading import Lock
+
+import numpy as np
+from spacy.attrs import ORTH
+
+from config import Config
+from utils.cache import LRUCache
+from utils.nlp_registry import get_nlp, nlp_registry
+from utils.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+class VectorService:
+    """
+    Document vectors for semantic similarity.
+
+    Vectors are computed over whole batches and cached by a hash of the
+    (truncated) text, so a JD or resume seen before is never re-vectorised.
+    Similarities for a batch are a single matrix-vector product.
+
+    In "static" mode a document vector is computed like Doc.vector for
+    static word vectors (the mean of token rows, zeros for unknown tokens)
+    straight from the vectors table: only the tokenizer runs. "pipeline"
+    mode goes through nlp.pipe with the vectors-only pipeline variant, and
+    is used automatically when the model has no plain static table.
+    """
+
+    # Text length used for document vectors
+    MAX_TEXT_LENGTH = 10000
+
+    def __init__(self, model_name=None, cache_size=1024, batch_size=32, mode="static"):
+        if mode not in ("static", "pipeline"):
+            raise ValueError(f"Unknown vector mode: {mode}")
+        self.nlp = get_nlp(model_name, variant="vectors")
+        self.model_name = model_name or nlp_registry.default_model
+        self.batch_size = batch_size
+        self.cache = LRUCache(cache_size)
+        # Shared memory-mapped table, if one was exported for this model
+        self.store = get_vector_store(self.model_name)
+
+        vectors = self.nlp.vocab.vectors
+        if mode == "static" and (vectors.mode != "default" or not vectors.size):
+            logger.info(
+                f"{self.model_name} has no static vector table; using pipeline vectors"
+            )
+            mode = "pipeline"
+        self.mode = mode
+
+    @staticmethod
+    def text_key(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def vectors(self, texts):
+        """(len(texts), dim) float32 matrix of document vectors"""
+        texts = [text[: self.MAX_TEXT_LENGTH] for text in texts]
+        keys = [self.text_key(text) for text in texts]
+        found = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            vector = self.cache.get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing[key] = text
+
+        if missing:
+            if self.mode == "static":
+                computed = self.static_vectors(missing.values())
+            else:
+                computed = self.pipeline_vectors(missing.values())
+            for key, vector in zip(missing, computed):
+                vector.flags.writeable = False
+                self.cache.set(key, vector)
+                found[key] = vector
+
+        if not texts:
+            return np.zeros((0, self.nlp.vocab.vectors_length), dtype=np.float32)
+        return np.vstack([found[key] for key in keys])
+
+    def pipeline_vectors(self, texts):
+        """Doc.vector for each text via the vectors-only pipeline"""
+        for doc in self.nlp.pipe(texts, batch_size=self.batch_size):
+            yield np.asarray(doc.vector, dtype=np.float32)
+
+    def _find_rows(self, keys):
+        return np.asarray(self.nlp.vocab.vectors.find(keys=keys))
+
+    def static_vectors(self, texts):
+        """Mean static word vector of each text, read from the vectors table"""
+        if self.store is not None:
+            table, find_rows = self.store.vectors, self.store.find
+        else:
+            table, find_rows = np.asarray(self.nlp.vocab.vectors.data), self._find_rows
+        for doc in self.nlp.tokenizer.pipe(texts, batch_size=self.batch_size):
+            if not len(doc):
+                yield np.zeros(table.shape[1], dtype=np.float32)
+                continue
+            rows = find_rows(doc.to_array(ORTH))
+            rows = rows[rows >= 0]
+            # Unknown tokens count as zero vectors, as in Doc.vector
+            total = table[rows].sum(axis=0, dtype=np.float32)
+            yield total / np.float32(len(doc))
+
+    def vector(self, text):
+        """Document vector for a single text (read-only)"""
+        return self.vectors([text])[0]
+
+    @staticmethod
+    def cosine_similarities(matrix, query_vector):
+        """Cosine of each row of matrix with query_vector (0 for empty vectors)"""
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vector)
+        dots = matrix @ query_vector
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    @staticmethod
+    def cosine_matrix(rows, columns):
+        """(len(rows), len(columns)) cosine matrix (0 for empty vectors)"""
+        return _unit_rows(rows) @ _unit_rows(columns).T
+
+    def similarities(self, texts, query_text=None, query_vector=None):
+        """Percent cosine similarity of each text to a query text or vector"""
+        if query_vector is None:
+            query_vector = self.vector(query_text)
+        return self.cosine_similarities(self.vectors(texts), query_vector) * 100
+
+
+def _unit_rows(matrix):
+    """Rows scaled to unit length; all-zero rows stay zero"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+_services = {}
+_services_lock = Lock()
+
+
+def get_vector_service(model_name=None):
+    """Shared VectorService for a spaCy model"""
+    model_name = model_name or nlp_registry.default_model
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = VectorService(
+                model_name, Config.VECTOR_CACHE_SIZE, mode=Config.VECTOR_MODE
+            )
+            _services[model_name] = service
+        return service
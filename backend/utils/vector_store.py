@@ -0,0 +1,177 @@
+"""
+Word-vector table exported to flat .npy files and memory-mapped.
+
+Every worker process opens the same files with np.load(mmap_mode="r"), so
+the table lives once in the OS page cache instead of once per process.
+Export it from the backend directory with:
+
+    python -m utils.vector_store export [--model en_core_web_md] [--dtype float16]
+"""
+
+import argparse
+import json
+import logging
+import os
+from threading import Lock
+
+import numpy as np
+import spacy
+from spacy.vectors import Vectors
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+KEYS_FILE = "keys.npy"
+ROWS_FILE = "rows.npy"
+VECTORS_FILE = "vectors.npy"
+
+DTYPES = ("float32", "float16")
+
+
+class VectorStore:
+    """
+    Read-only, memory-mapped copy of a spaCy model's static vectors.
+
+    keys holds the sorted uint64 ORTH hashes and rows the table row for each
+    key, so lookups are a vectorised binary search. vectors keeps the
+    model's own row order, which lets a float32 store stand in for the
+    model's vectors table (see attach).
+    """
+
+    def __init__(self, keys, rows, vectors, meta):
+        self.keys = keys
+        self.rows = rows
+        self.vectors = vectors
+        self.meta = meta
+
+    @property
+    def shape(self):
+        return self.vectors.shape
+
+    def find(self, keys):
+        """Row of each key in vectors, -1 where the key has no vector"""
+        keys = np.asarray(keys, dtype=np.uint64)
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.searchsorted(self.keys, keys)
+        positions[positions == len(self.keys)] = 0
+        found = self.keys[positions] == keys
+        return np.where(found, self.rows[positions], -1)
+
+    @classmethod
+    def export(cls, nlp, directory, dtype="float32"):
+        """Write nlp's vectors table to directory"""
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        vectors = nlp.vocab.vectors
+        if vectors.mode != "default" or not vectors.size:
+            raise ValueError("Model has no static vectors table to export")
+
+        key_rows = sorted(vectors.key2row.items())
+        keys = np.fromiter((key for key, _ in key_rows), dtype=np.uint64)
+        rows = np.fromiter((row for _, row in key_rows), dtype=np.int64)
+
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, KEYS_FILE), keys)
+        np.save(os.path.join(directory, ROWS_FILE), rows)
+        np.save(
+            os.path.join(directory, VECTORS_FILE),
+            np.asarray(vectors.data).astype(dtype),
+        )
+        meta = {
+            "model": f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}",
+            "version": nlp.meta.get("version"),
+            "vectors_name": vectors.name,
+            "dtype": dtype,
+            "shape": list(vectors.data.shape),
+            "keys": len(keys),
+        }
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+        return meta
+
+    @classmethod
+    def load(cls, directory):
+        """Open an exported store; all arrays are memory-mapped"""
+        with open(os.path.join(directory, META_FILE), "r") as f:
+            meta = json.load(f)
+        return cls(
+            np.load(os.path.join(directory, KEYS_FILE), mmap_mode="r"),
+            np.load(os.path.join(directory, ROWS_FILE), mmap_mode="r"),
+            np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r"),
+            meta,
+        )
+
+    def attach(self, nlp):
+        """
+        Replace nlp's vectors table with this store's memory-mapped one.
+        Only float32 stores can back a pipeline (tok2vec reads the table).
+        """
+        if self.vectors.dtype != np.float32:
+            raise ValueError("Only float32 vector stores can back a pipeline")
+        table = Vectors(
+            strings=nlp.vocab.strings,
+            data=self.vectors,
+            name=self.meta.get("vectors_name"),
+        )
+        for key, row in zip(self.keys.tolist(), self.rows.tolist()):
+            table.add(key, row=row)
+        nlp.vocab.vectors = table
+        return nlp
+
+
+def vector_store_dir(model_name):
+    """Directory of the exported store for a model (name or path)"""
+    return os.path.join(
+        Config.VECTOR_STORE_DIR, os.path.basename(os.path.normpath(model_name))
+    )
+
+
+_stores = {}
+_stores_lock = Lock()
+
+
+def get_vector_store(model_name):
+    """Shared VectorStore for a model, or None if none was exported"""
+    with _stores_lock:
+        if model_name not in _stores:
+            directory = vector_store_dir(model_name)
+            store = None
+            if Config.VECTOR_STORE_DIR and os.path.exists(
+                os.path.join(directory, META_FILE)
+            ):
+                try:
+                    store = VectorStore.load(directory)
+                    logger.info(
+                        f"Memory-mapped {store.meta['dtype']} vectors for "
+                        f"{model_name} from {directory} {tuple(store.shape)}"
+                    )
+                except Exception as e:
+                    logger.error(f"Error opening vector store {directory}: {e}")
+            _stores[model_name] = store
+        return _stores[model_name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the shared vector store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Export a model's vectors")
+    export.add_argument("--model", default=Config.NLP_MODEL)
+    export.add_argument("--output", help="Defaults to VECTOR_STORE_DIR/<model>")
+    export.add_argument("--dtype", choices=DTYPES, default="float32")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    nlp = spacy.load(args.model)
+    directory = args.output or vector_store_dir(args.model)
+    meta = VectorStore.export(nlp, directory, args.dtype)
+    logger.info(
+        f"Exported {meta['keys']} keys / {meta['shape']} {meta['dtype']} "
+        f"vectors to {directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()